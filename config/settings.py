@@ -6,6 +6,7 @@ This module contains all configuration settings, default values,
 and application constants.
 """
 
+import functools
 import os
 from pathlib import Path
 
@@ -19,22 +20,55 @@ BASE_DIR = Path(__file__).parent.parent
 INPUT_DIR = BASE_DIR / "input_files"
 
 # Default to Windows Downloads folder for output
-try:
-    import os
-    DOWNLOADS_DIR = Path(os.path.expanduser("~")) / "Downloads"
-    OUTPUT_DIR = DOWNLOADS_DIR if DOWNLOADS_DIR.exists() else BASE_DIR / "output_files"
-except Exception:
-    # Fallback to local directory if there's any issue
-    OUTPUT_DIR = BASE_DIR / "output_files"
+DOWNLOADS_DIR = Path(os.path.expanduser("~")) / "Downloads"
+
+# Environment variable that overrides the output directory (skips the probe)
+OUTPUT_DIR_ENV_VAR = "EXCELFORMATTER_OUTPUT_DIR"
+
+
+@functools.lru_cache(maxsize=None)
+def get_output_dir() -> Path:
+    """
+    Resolve the default output directory on first use.
+    
+    The Downloads probe is a filesystem stat, so it runs at most once per
+    process rather than on every import of this module.
+    """
+    override = os.environ.get(OUTPUT_DIR_ENV_VAR)
+    if override:
+        return Path(override)
+    try:
+        return DOWNLOADS_DIR if DOWNLOADS_DIR.exists() else BASE_DIR / "output_files"
+    except Exception:
+        # Fallback to local directory if there's any issue
+        return BASE_DIR / "output_files"
+
+
+def __getattr__(name):
+    """Resolve OUTPUT_DIR lazily for code that accesses settings.OUTPUT_DIR."""
+    if name == "OUTPUT_DIR":
+        return get_output_dir()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 CONFIG_DIR = BASE_DIR / "config"
 LOG_DIR = BASE_DIR / "logs"
 
-# Ensure directories exist
-INPUT_DIR.mkdir(exist_ok=True)
-OUTPUT_DIR.mkdir(exist_ok=True)
-CONFIG_DIR.mkdir(exist_ok=True)
-LOG_DIR.mkdir(exist_ok=True)
+# Directories are created on first use by ensure_dirs(), not at import
+_dirs_ready = False
+
+
+def ensure_dirs():
+    """Create the application directories once per process."""
+    global _dirs_ready
+    if _dirs_ready:
+        return
+    INPUT_DIR.mkdir(parents=True, exist_ok=True)
+    get_output_dir().mkdir(parents=True, exist_ok=True)
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    _dirs_ready = True
+
 
 # Logging Configuration
 LOG_LEVEL = "INFO"
@@ -46,6 +80,7 @@ LOG_BACKUP_COUNT = 5
 WINDOW_TITLE = f"{APP_NAME} v{APP_VERSION}"
 WINDOW_SIZE = "900x700"
 WINDOW_MIN_SIZE = (800, 600)
+MAPPING_ROW_BUFFER = 5  # Off-screen mapping rows kept built above and below the view
 
 # File Processing Configuration
 SUPPORTED_INPUT_FORMATS = [".xlsx", ".xls", ".xlsm"]
@@ -110,6 +145,9 @@ FONTS = {
 # Progress Dialog Settings
 PROGRESS_UPDATE_INTERVAL = 100  # milliseconds
 
+# Column Mapper Settings
+MAPPING_CHANGE_DELAY = 150  # milliseconds of typing pause before notifying
+
 # Error Messages
 ERROR_MESSAGES = {
     "no_input_file": "Please select an input Excel file.",
@@ -156,6 +194,50 @@ DEFAULT_MAPPING_CONFIG = {
     }
 }
 
+# Sample Configuration written by ConfigManager.create_sample_config
+SAMPLE_CONFIG = {
+    "output_columns": [
+        {
+            "name": "Employee Name",
+            "source_column": "Name",
+            "alignment": "left",
+            "width": 20,
+            "formatting": {}
+        },
+        {
+            "name": "Amount",
+            "source_column": "Net Pay",
+            "alignment": "right",
+            "width": 12,
+            "formatting": {
+                "number_format": "#,##0.00"
+            }
+        },
+        {
+            "name": "Date",
+            "source_column": "Pay Date",
+            "alignment": "center",
+            "width": 12,
+            "formatting": {
+                "date_format": "MM/DD/YYYY"
+            }
+        }
+    ],
+    "header_formatting": {
+        "bold": True,
+        "background_color": "366092",
+        "font_color": "FFFFFF",
+        "alignment": "center"
+    },
+    "general_settings": {
+        "auto_fit_columns": True
+    },
+    "void": {
+        "enabled": False,
+        "zero_columns": []
+    }
+}
+
 # File Dialog Settings
 FILE_DIALOG_OPTIONS = {
     "input_filetypes": [
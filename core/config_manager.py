@@ -6,20 +6,194 @@ This module handles loading, saving, and validating configuration files
 for the Excel Formatter application.
 """
 
+import copy
+import functools
 import json
 import logging
+import mmap
+import os
+import re
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
 
-from config.settings import DEFAULT_MAPPING_CONFIG, DEFAULT_CONFIG_FILE
+from config.settings import (
+    DEFAULT_MAPPING_CONFIG, DEFAULT_CONFIG_FILE, SAMPLE_CONFIG
+)
+
+# orjson is an optional, much faster drop-in for the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# fastjsonschema compiles CONFIG_SCHEMA into a specialized validator function
+try:
+    import fastjsonschema  # type: ignore[import-untyped]
+except ImportError:
+    fastjsonschema = None
+
+# ijson lets very large configs be parsed and validated incrementally
+try:
+    import ijson  # type: ignore[import-untyped]
+except ImportError:
+    ijson = None
+
+# Configs at least this large are parsed straight from a memory map;
+# below it the mmap setup costs more than a plain read
+MMAP_MIN_SIZE = 64 * 1024
+
+# Configs at least this large are streamed with ijson when it is installed
+STREAMING_MIN_SIZE = 50 * 1024 * 1024
+
+_START_EVENTS = frozenset(("start_map", "start_array"))
+_END_EVENTS = frozenset(("end_map", "end_array"))
+
+# (prefix, event, value) triples produced by ijson.parse
+StreamEvents = Iterator[Tuple[str, str, Any]]
+
+# Legacy freeze_panes cell reference, e.g. "A2" or "B3"
+_CELL_REF_RE = re.compile(r'[A-Z]+\d+')
+
+_HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
+_ALIGNMENTS = frozenset(("left", "center", "right"))
+
+# Sentinel for absent keys, distinct from an explicit None
+_MISSING = object()
+
+# Optional typed fields per config section: (field, type, type description)
+TypedFields = Tuple[Tuple[str, type, str], ...]
+
+_COLUMN_TYPED_FIELDS: TypedFields = (
+    ("source_column", str, "a string"),
+    ("formatting", dict, "a dictionary"),
+)
+_HEADER_TYPED_FIELDS: TypedFields = (("bold", bool, "boolean"),)
+_HEADER_COLOR_FIELDS = ("background_color", "font_color")
+_GENERAL_TYPED_FIELDS: TypedFields = (("auto_fit_columns", bool, "boolean"),)
+_FREEZE_PANES_TYPED_FIELDS: TypedFields = (("freeze_header", bool, "boolean"),)
+_VOID_TYPED_FIELDS: TypedFields = (("enabled", bool, "boolean"),)
+
+_ALIGNMENT_SCHEMA = {"enum": ["left", "center", "right"]}
+_HEX_COLOR_SCHEMA = {"type": "string", "maxLength": 6, "pattern": "^([0-9a-fA-F]{6})?$"}
+_STRING_LIST_SCHEMA = {"type": "array", "items": {"type": "string"}}
+
+# JSON Schema mirroring the hand-written _validate_* checks. It is never
+# looser than them, so a config it accepts is valid; anything it rejects
+# is re-checked by the hand-written validators for the error message.
+CONFIG_SCHEMA = {
+    "type": "object",
+    "required": ["output_columns"],
+    "properties": {
+        "output_columns": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["name"],
+                "properties": {
+                    "name": {"type": "string", "pattern": "\\S"},
+                    "source_column": {"type": "string"},
+                    "alignment": _ALIGNMENT_SCHEMA,
+                    "width": {"type": "number", "exclusiveMinimum": 0},
+                    "formatting": {"type": "object"}
+                }
+            }
+        },
+        "header_formatting": {
+            "type": "object",
+            "properties": {
+                "bold": {"type": "boolean"},
+                "background_color": _HEX_COLOR_SCHEMA,
+                "font_color": _HEX_COLOR_SCHEMA,
+                "alignment": _ALIGNMENT_SCHEMA
+            }
+        },
+        "general_settings": {
+            "type": "object",
+            "properties": {
+                "auto_fit_columns": {"type": "boolean"},
+                "freeze_panes": {
+                    "anyOf": [
+                        {"type": "null"},
+                        # Python regex: \Z, unlike $, rejects a trailing newline
+                        {"type": "string", "pattern": "^[A-Za-z]+[0-9]+\\Z"},
+                        {
+                            "type": "object",
+                            "properties": {
+                                "freeze_header": {"type": "boolean"},
+                                "freeze_columns": _STRING_LIST_SCHEMA
+                            }
+                        }
+                    ]
+                }
+            }
+        },
+        "void": {
+            "type": "object",
+            "properties": {
+                "enabled": {"type": "boolean"},
+                "zero_columns": _STRING_LIST_SCHEMA
+            }
+        }
+    }
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_schema_validator() -> Optional[Callable[[Any], Any]]:
+    """Compile CONFIG_SCHEMA once per process, or None without fastjsonschema."""
+    if fastjsonschema is None:
+        return None
+    return fastjsonschema.compile(CONFIG_SCHEMA)
+
+
+
+def _dump_config(config: Mapping[str, Any]) -> bytes:
+    """Serialize a configuration to pretty-printed UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(
+            config,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        )
+    # Match orjson's layout: 2-space indent and a trailing newline
+    return (json.dumps(config, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def _write_atomic(config_path: Path, payload: bytes) -> None:
+    """
+    Write payload to a temp file, then atomically swap it into place so a
+    crash mid-write never leaves a truncated config behind.
+    """
+    tmp_path = config_path.with_name(config_path.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, config_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+# Sample configuration serialized once at import for create_sample_config
+_SAMPLE_CONFIG_BYTES = _dump_config(SAMPLE_CONFIG)
 
 
 class ConfigManager:
     """Manages configuration loading, saving, and validation."""
     
-    def __init__(self):
+    __slots__ = ("_cache", "_validator")
+    
+    # Shared by all instances; resolved once at class creation
+    logger = logging.getLogger(__name__)
+    
+    def __init__(self) -> None:
         """Initialize the configuration manager."""
-        self.logger = logging.getLogger(__name__)
+        # Signature (st_mtime_ns, st_size) of the last validated parse per path
+        self._cache: Dict[str, Tuple[int, int]] = {}
+        self._validator = _get_schema_validator()
         
     def load_config(self, config_path: Path) -> Dict[str, Any]:
         """
@@ -37,61 +211,166 @@ class ConfigManager:
             ValueError: If configuration is invalid
         """
         try:
-            self.logger.info(f"Loading configuration from: {config_path}")
+            self.logger.info("Loading configuration from: %s", config_path)
             
             if not config_path.exists():
                 raise FileNotFoundError(f"Configuration file not found: {config_path}")
                 
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            # Re-parsing is cheaper than copying a cached dict, so only the
+            # validation of an unchanged file is skipped
+            stat = config_path.stat()
+            cache_key = str(config_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            validated = self._cache.get(cache_key) == signature
+            
+            # Parse raw bytes so no intermediate decoded str is built
+            with open(config_path, 'rb') as f:
+                file_size = os.fstat(f.fileno()).st_size
+                if ijson is not None and file_size >= STREAMING_MIN_SIZE:
+                    # Validated section by section while it streams
+                    config = self._parse_config_stream(f)
+                    validated = True
+                elif orjson is not None and file_size >= MMAP_MIN_SIZE:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        config = orjson.loads(memoryview(mm))
+                else:
+                    data = f.read()
+                    config = orjson.loads(data) if orjson is not None else json.loads(data)
                 
-            # Validate configuration
-            self.validate_config(config)
+            if validated:
+                self.logger.info("Configuration unchanged, skipping validation")
+            else:
+                # Validate configuration
+                self.validate_config(config)
+            self._cache[cache_key] = signature
             
             self.logger.info("Configuration loaded and validated successfully")
             return config
             
         except json.JSONDecodeError as e:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
             error_msg = f"Invalid JSON in configuration file: {str(e)}"
             self.logger.error(error_msg)
             raise json.JSONDecodeError(error_msg, e.doc, e.pos)
             
         except Exception as e:
-            self.logger.error(f"Error loading configuration: {str(e)}")
+            self.logger.error("Error loading configuration: %s", e)
             raise
             
-    def save_config(self, config: Dict[str, Any], config_path: Path):
+    def _parse_config_stream(self, f: BinaryIO) -> Dict[str, Any]:
+        """
+        Parse and validate a huge configuration file incrementally with ijson.
+        
+        Each output column is validated as soon as it has been read, so a
+        bad column fails fast without building the rest of the document.
+        The remaining sections are checked once the stream ends, so the
+        result needs no second pass through validate_config.
+        
+        Args:
+            f: Configuration file opened in binary mode
+            
+        Returns:
+            Validated configuration dictionary
+            
+        Raises:
+            ValueError: If configuration is invalid
+        """
+        try:
+            events = ijson.parse(f, use_float=True)
+            _, event, _ = next(events)
+            if event != "start_map":
+                raise ValueError("Invalid configuration: Configuration must be a dictionary")
+                
+            config: Dict[str, Any] = {}
+            columns_streamed = False
+            for _, event, key in events:
+                if event != "map_key":
+                    break  # end of the top-level object
+                    
+                _, event, value = next(events)
+                if key == "output_columns" and event == "start_array":
+                    config[key] = self._stream_output_columns(events)
+                    columns_streamed = True
+                else:
+                    config[key] = self._build_stream_value(event, value, events)
+                    
+        except ijson.JSONError as e:
+            raise json.JSONDecodeError(str(e), "", 0)
+            
+        try:
+            if not columns_streamed:
+                self._validate_output_columns(config)
+            elif not config["output_columns"]:
+                raise ValueError("'output_columns' cannot be empty")
+            self._validate_sections(config)
+        except ValueError as e:
+            raise ValueError(f"Invalid configuration: {str(e)}")
+        return config
+            
+    def _stream_output_columns(self, events: StreamEvents) -> List[Dict[str, Any]]:
+        """Build and validate output columns one at a time from ijson events."""
+        output_columns: List[Dict[str, Any]] = []
+        validate_column = self._validate_column_config
+        for col_num, (_, event, value) in enumerate(events, 1):
+            if event == "end_array":
+                break
+            col_config = self._build_stream_value(event, value, events)
+            try:
+                validate_column(col_config, col_num)
+            except ValueError as e:
+                raise ValueError(f"Invalid configuration: {str(e)}")
+            output_columns.append(col_config)
+        return output_columns
+        
+    def _build_stream_value(self, event: str, value: Any, events: StreamEvents) -> Any:
+        """Materialize one JSON value whose first ijson event is (event, value)."""
+        builder = ijson.ObjectBuilder()
+        builder.event(event, value)
+        depth = 1 if event in _START_EVENTS else 0
+        while depth:
+            _, event, value = next(events)
+            builder.event(event, value)
+            if event in _START_EVENTS:
+                depth += 1
+            elif event in _END_EVENTS:
+                depth -= 1
+        return builder.value
+        
+    def save_config(self, config: Dict[str, Any], config_path: Path, *,
+                    already_validated: bool = False) -> None:
         """
         Save configuration to JSON file.
         
         Args:
             config: Configuration dictionary to save
             config_path: Path where to save configuration
+            already_validated: Skip validation when the caller has already
+                validated config
             
         Raises:
             ValueError: If configuration is invalid
             OSError: If file cannot be written
         """
         try:
-            self.logger.info(f"Saving configuration to: {config_path}")
+            self.logger.info("Saving configuration to: %s", config_path)
             
             # Validate configuration before saving
-            self.validate_config(config)
+            if not already_validated:
+                self.validate_config(config)
             
             # Ensure directory exists
             config_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Save with pretty formatting
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
+            _write_atomic(config_path, _dump_config(config))
                 
             self.logger.info("Configuration saved successfully")
             
         except Exception as e:
-            self.logger.error(f"Error saving configuration: {str(e)}")
+            self.logger.error("Error saving configuration: %s", e)
             raise
             
-    def validate_config(self, config: Dict[str, Any]):
+    def validate_config(self, config: Dict[str, Any]) -> None:
         """
         Validate configuration dictionary.
         
@@ -101,6 +380,17 @@ class ConfigManager:
         Raises:
             ValueError: If configuration is invalid
         """
+        # Fast path: the compiled schema accepts every well-formed config
+        if self._validator is not None:
+            try:
+                self._validator(config)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Configuration validation passed")
+                return
+            except fastjsonschema.JsonSchemaException:
+                # Fall through to the detailed checks for a precise error
+                pass
+                
         try:
             # Check that config is a dictionary
             if not isinstance(config, dict):
@@ -109,175 +399,178 @@ class ConfigManager:
             # Validate output columns
             self._validate_output_columns(config)
             
-            # Validate header formatting if present
-            if "header_formatting" in config:
-                self._validate_header_formatting(config["header_formatting"])
+            # Validate the optional sections
+            self._validate_sections(config)
                 
-            # Validate general settings if present
-            if "general_settings" in config:
-                self._validate_general_settings(config["general_settings"])
-                
-            # Validate void settings if present
-            if "void" in config:
-                self._validate_void_settings(config["void"])
-                
-            self.logger.debug("Configuration validation passed")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Configuration validation passed")
             
         except Exception as e:
-            self.logger.error(f"Configuration validation failed: {str(e)}")
+            self.logger.error("Configuration validation failed: %s", e)
             raise ValueError(f"Invalid configuration: {str(e)}")
             
-    def _validate_output_columns(self, config: Dict[str, Any]):
+    def _validate_sections(self, config: Dict[str, Any]) -> None:
+        """Validate the optional configuration sections that are present."""
+        # Validate header formatting if present
+        if "header_formatting" in config:
+            self._validate_header_formatting(config["header_formatting"])
+            
+        # Validate general settings if present
+        if "general_settings" in config:
+            self._validate_general_settings(config["general_settings"])
+            
+        # Validate void settings if present
+        if "void" in config:
+            self._validate_void_settings(config["void"])
+            
+    def _validate_output_columns(self, config: Dict[str, Any]) -> None:
         """Validate output columns configuration."""
-        if "output_columns" not in config:
+        output_columns = config.get("output_columns", _MISSING)
+        if output_columns is _MISSING:
             raise ValueError("Missing required 'output_columns' field")
             
-        output_columns = config["output_columns"]
-        
         if not isinstance(output_columns, list):
             raise ValueError("'output_columns' must be a list")
             
         if not output_columns:
             raise ValueError("'output_columns' cannot be empty")
             
-        # Validate each column
-        for i, col_config in enumerate(output_columns):
-            self._validate_column_config(col_config, i + 1)
+        # Validate each column; the loop is GIL-bound pure Python, so a
+        # thread pool would only add overhead - keep it serial and tight
+        validate_column = self._validate_column_config
+        for col_num, col_config in enumerate(output_columns, 1):
+            validate_column(col_config, col_num)
             
-    def _validate_column_config(self, col_config: Dict[str, Any], col_num: int):
+    def _validate_column_config(self, col_config: Dict[str, Any], col_num: int) -> None:
         """Validate individual column configuration."""
         if not isinstance(col_config, dict):
             raise ValueError(f"Column {col_num} must be a dictionary")
             
         # Required fields
-        if "name" not in col_config:
+        name = col_config.get("name", _MISSING)
+        if name is _MISSING:
             raise ValueError(f"Column {col_num} missing required 'name' field")
             
-        if not isinstance(col_config["name"], str):
+        if not isinstance(name, str):
             raise ValueError(f"Column {col_num} 'name' must be a string")
             
-        if not col_config["name"].strip():
+        if not name.strip():
             raise ValueError(f"Column {col_num} 'name' cannot be empty")
             
         # Optional fields validation
-        if "source_column" in col_config and not isinstance(col_config["source_column"], str):
-            raise ValueError(f"Column {col_num} 'source_column' must be a string")
-            
-        if "alignment" in col_config:
-            alignment = col_config["alignment"]
-            if alignment not in ["left", "center", "right"]:
-                raise ValueError(f"Column {col_num} invalid alignment: {alignment}")
-                
-        if "width" in col_config:
-            try:
-                width = float(col_config["width"])
-                if width <= 0:
-                    raise ValueError(f"Column {col_num} width must be positive")
-            except (TypeError, ValueError):
+        self._check_typed_fields(col_config, _COLUMN_TYPED_FIELDS, f"Column {col_num}")
+        
+        alignment = col_config.get("alignment", _MISSING)
+        if alignment is not _MISSING and (not isinstance(alignment, str) or alignment not in _ALIGNMENTS):
+            raise ValueError(f"Column {col_num} invalid alignment: {alignment}")
+            
+        width = col_config.get("width", _MISSING)
+        if width is not _MISSING:
+            # bool is an int subclass but never a meaningful width
+            if isinstance(width, bool):
                 raise ValueError(f"Column {col_num} width must be a number")
+            if not isinstance(width, (int, float)):
+                # Legacy configs may carry numeric strings such as "15"
+                try:
+                    width = float(width)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Column {col_num} width must be a number")
+            if width <= 0:
+                raise ValueError(f"Column {col_num} width must be positive")
                 
-        if "formatting" in col_config and not isinstance(col_config["formatting"], dict):
-            raise ValueError(f"Column {col_num} 'formatting' must be a dictionary")
-            
-    def _validate_header_formatting(self, header_config: Dict[str, Any]):
+    def _validate_header_formatting(self, header_config: Dict[str, Any]) -> None:
         """Validate header formatting configuration."""
         if not isinstance(header_config, dict):
             raise ValueError("'header_formatting' must be a dictionary")
             
         # Validate boolean fields
-        for field in ["bold"]:
-            if field in header_config and not isinstance(header_config[field], bool):
-                raise ValueError(f"Header formatting '{field}' must be boolean")
-                
+        self._check_typed_fields(header_config, _HEADER_TYPED_FIELDS, "Header formatting")
+        
         # Validate color fields (should be hex colors without #)
-        for field in ["background_color", "font_color"]:
-            if field in header_config:
-                color = header_config[field]
+        for field in _HEADER_COLOR_FIELDS:
+            color = header_config.get(field, _MISSING)
+            if color is not _MISSING:
                 if not isinstance(color, str):
                     raise ValueError(f"Header formatting '{field}' must be a string")
                 if color and not self._is_valid_hex_color(color):
                     raise ValueError(f"Header formatting '{field}' must be a valid hex color")
                     
         # Validate alignment
-        if "alignment" in header_config:
-            alignment = header_config["alignment"]
-            if alignment not in ["left", "center", "right"]:
-                raise ValueError(f"Header formatting invalid alignment: {alignment}")
+        alignment = header_config.get("alignment", _MISSING)
+        if alignment is not _MISSING and (not isinstance(alignment, str) or alignment not in _ALIGNMENTS):
+            raise ValueError(f"Header formatting invalid alignment: {alignment}")
                 
-    def _validate_general_settings(self, general_config: Dict[str, Any]):
+    def _validate_general_settings(self, general_config: Dict[str, Any]) -> None:
         """Validate general settings configuration."""
         if not isinstance(general_config, dict):
             raise ValueError("'general_settings' must be a dictionary")
             
         # Validate boolean fields
-        for field in ["auto_fit_columns"]:
-            if field in general_config and not isinstance(general_config[field], bool):
-                raise ValueError(f"General settings '{field}' must be boolean")
-                
+        self._check_typed_fields(general_config, _GENERAL_TYPED_FIELDS, "General settings")
+        
         # Validate freeze_panes format (string for legacy, dict for new format)
-        if "freeze_panes" in general_config:
-            freeze_panes = general_config["freeze_panes"]
-            if freeze_panes:
-                if isinstance(freeze_panes, str):
-                    # Legacy format (e.g., "A2", "B3") - validate Excel cell reference
-                    import re
-                    if not re.match(r'^[A-Z]+\d+$', freeze_panes.upper()):
-                        raise ValueError("General settings 'freeze_panes' string must be a valid Excel cell reference (e.g., 'A2', 'B3')")
-                elif isinstance(freeze_panes, dict):
-                    # New format with freeze_header and freeze_columns
-                    if "freeze_header" in freeze_panes and not isinstance(freeze_panes["freeze_header"], bool):
-                        raise ValueError("General settings freeze_panes 'freeze_header' must be boolean")
-                    if "freeze_columns" in freeze_panes:
-                        freeze_columns = freeze_panes["freeze_columns"]
-                        if not isinstance(freeze_columns, list):
-                            raise ValueError("General settings freeze_panes 'freeze_columns' must be a list")
-                        for i, col_name in enumerate(freeze_columns):
-                            if not isinstance(col_name, str):
-                                raise ValueError(f"General settings freeze_panes 'freeze_columns[{i}]' must be a string")
-                else:
-                    raise ValueError("General settings 'freeze_panes' must be a string or dictionary")
-                
-    def _validate_void_settings(self, void_config: Dict[str, Any]):
+        freeze_panes = general_config.get("freeze_panes")
+        if freeze_panes:
+            if isinstance(freeze_panes, str):
+                # Legacy format (e.g., "A2", "B3") - validate Excel cell reference
+                if not _CELL_REF_RE.fullmatch(freeze_panes.upper()):
+                    raise ValueError("General settings 'freeze_panes' string must be a valid Excel cell reference (e.g., 'A2', 'B3')")
+            elif isinstance(freeze_panes, dict):
+                # New format with freeze_header and freeze_columns
+                self._check_typed_fields(
+                    freeze_panes, _FREEZE_PANES_TYPED_FIELDS, "General settings freeze_panes"
+                )
+                self._check_string_list(
+                    freeze_panes, "freeze_columns", "General settings freeze_panes"
+                )
+            else:
+                raise ValueError("General settings 'freeze_panes' must be a string or dictionary")
+            
+    def _validate_void_settings(self, void_config: Dict[str, Any]) -> None:
         """Validate void filtering configuration."""
         if not isinstance(void_config, dict):
             raise ValueError("'void' must be a dictionary")
             
         # Validate enabled field
-        if "enabled" in void_config and not isinstance(void_config["enabled"], bool):
-            raise ValueError("Void settings 'enabled' must be boolean")
-            
+        self._check_typed_fields(void_config, _VOID_TYPED_FIELDS, "Void settings")
+        
         # Validate zero_columns field
-        if "zero_columns" in void_config:
-            zero_columns = void_config["zero_columns"]
-            if not isinstance(zero_columns, list):
-                raise ValueError("Void settings 'zero_columns' must be a list")
-            for i, col_name in enumerate(zero_columns):
-                if not isinstance(col_name, str):
-                    raise ValueError(f"Void settings 'zero_columns[{i}]' must be a string")
-                    
+        self._check_string_list(void_config, "zero_columns", "Void settings")
+        
+    def _check_typed_fields(self, section: Dict[str, Any], fields: TypedFields, prefix: str) -> None:
+        """Check optional fields in section against a (field, type, description) table."""
+        for field, expected_type, type_name in fields:
+            value = section.get(field, _MISSING)
+            if value is not _MISSING and not isinstance(value, expected_type):
+                raise ValueError(f"{prefix} '{field}' must be {type_name}")
+                
+    def _check_string_list(self, section: Dict[str, Any], field: str, prefix: str) -> None:
+        """Check that an optional field in section is a list of strings."""
+        values = section.get(field, _MISSING)
+        if values is _MISSING:
+            return
+        if not isinstance(values, list):
+            raise ValueError(f"{prefix} '{field}' must be a list")
+        for i, value in enumerate(values):
+            if not isinstance(value, str):
+                raise ValueError(f"{prefix} '{field}[{i}]' must be a string")
+                
     def _is_valid_hex_color(self, color: str) -> bool:
         """Check if string is a valid hex color (without #)."""
         if not color:
             return True  # Empty string is allowed
             
         # Should be 6 characters, all hex digits
-        if len(color) != 6:
-            return False
-            
-        try:
-            int(color, 16)
-            return True
-        except ValueError:
-            return False
+        return len(color) == 6 and _HEX_DIGITS.issuperset(color)
             
     def get_default_config(self) -> Dict[str, Any]:
         """
         Get default configuration.
         
         Returns:
-            Default configuration dictionary
+            Default configuration dictionary, safe for the caller to mutate
         """
-        return DEFAULT_MAPPING_CONFIG.copy()
+        return copy.deepcopy(DEFAULT_MAPPING_CONFIG)
         
     def load_default_config(self) -> Dict[str, Any]:
         """
@@ -293,10 +586,10 @@ class ConfigManager:
                 self.logger.info("No default config file found, using built-in defaults")
                 return self.get_default_config()
         except Exception as e:
-            self.logger.warning(f"Error loading default config: {str(e)}, using built-in defaults")
+            self.logger.warning("Error loading default config: %s, using built-in defaults", e)
             return self.get_default_config()
             
-    def create_sample_config(self, config_path: Path):
+    def create_sample_config(self, config_path: Path) -> None:
         """
         Create a sample configuration file.
         
@@ -304,52 +597,12 @@ class ConfigManager:
             config_path: Path where to create sample configuration
         """
         try:
-            sample_config = {
-                "output_columns": [
-                    {
-                        "name": "Employee Name",
-                        "source_column": "Name",
-                        "alignment": "left",
-                        "width": 20,
-                        "formatting": {}
-                    },
-                    {
-                        "name": "Amount",
-                        "source_column": "Net Pay",
-                        "alignment": "right",
-                        "width": 12,
-                        "formatting": {
-                            "number_format": "#,##0.00"
-                        }
-                    },
-                    {
-                        "name": "Date",
-                        "source_column": "Pay Date",
-                        "alignment": "center",
-                        "width": 12,
-                        "formatting": {
-                            "date_format": "MM/DD/YYYY"
-                        }
-                    }
-                ],
-                "header_formatting": {
-                    "bold": True,
-                    "background_color": "366092",
-                    "font_color": "FFFFFF",
-                    "alignment": "center"
-                },
-                "general_settings": {
-                    "auto_fit_columns": True
-                },
-                "void": {
-                    "enabled": False,
-                    "zero_columns": []
-                }
-            }
-            
-            self.save_config(sample_config, config_path)
-            self.logger.info(f"Sample configuration created at: {config_path}")
+            # The built-in sample is static and known to be valid, so write
+            # its pre-serialized bytes without re-validating or re-encoding
+            config_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(config_path, _SAMPLE_CONFIG_BYTES)
+            self.logger.info("Sample configuration created at: %s", config_path)
             
         except Exception as e:
-            self.logger.error(f"Error creating sample configuration: {str(e)}")
+            self.logger.error("Error creating sample configuration: %s", e)
             raise
\ No newline at end of file
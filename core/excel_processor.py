@@ -6,20 +6,98 @@ This module contains the core logic for reading, processing, and formatting
 Excel files based on configuration mappings.
 """
 
+import numpy as np
 import pandas as pd
-import openpyxl
-from openpyxl import load_workbook
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 import xlrd
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
 import logging
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+import multiprocessing
+from datetime import date, datetime
+import ast
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from config.settings import *
 
+try:
+    import python_calamine
+except ImportError:
+    python_calamine = None
+
+# Rust-based calamine reader for .xlsx/.xlsm when installed (pandas >= 2.2)
+_PANDAS_VERSION = tuple(int(part) for part in pd.__version__.split(".")[:2])
+XLSX_READ_ENGINE = 'calamine' if python_calamine is not None and _PANDAS_VERSION >= (2, 2) else 'openpyxl'
+
+# Column references in formulas: quoted names, then bare names with spaces/hyphens
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+_UNQUOTED_RE = re.compile(r'\b[A-Za-z][A-Za-z0-9_\s\-]*[A-Za-z0-9_]\b')
+
+# Formula safety checks: arithmetic characters plus placeholder identifiers, no risky keywords
+_SAFE_RE = re.compile(r'[0-9+\-*/()._ A-Za-z]*')
+_DANGER_RE = re.compile(r'(?i)\b(import|exec|eval|open|file)\b|__')
+
+# Syntax allowed in formulas: arithmetic on numbers and column placeholders
+_ALLOWED_FORMULA_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Pow,
+    ast.UAdd, ast.USub,
+)
+
+# openpyxl writes floats with 16 significant digits, not their repr
+_FLOAT_TEXT = "%.16g".__mod__
+
+
+def _cell_text(value: Any) -> str:
+    """Text of a value as openpyxl writes it into the sheet."""
+    return _FLOAT_TEXT(value) if isinstance(value, float) else str(value)
+
+
+class _FormulaValidator(ast.NodeVisitor):
+    """Reject formula syntax other than arithmetic on numbers and known placeholders."""
+    
+    def __init__(self, names):
+        self.names = names
+        
+    def generic_visit(self, node):
+        if not isinstance(node, _ALLOWED_FORMULA_NODES):
+            raise ValueError(f"unsupported syntax: {type(node).__name__}")
+        super().generic_visit(node)
+        
+    def visit_Constant(self, node):
+        if type(node.value) not in (int, float):
+            raise ValueError(f"unsupported constant: {node.value!r}")
+            
+    def visit_Name(self, node):
+        if node.id not in self.names:
+            raise ValueError(f"unknown name: {node.id}")
+
+
+def _init_worker_logging(log_queue, level: int) -> None:
+    """
+    Send a worker process's log records to the parent through log_queue.
+    
+    The parent's QueueListener hands them to its own handlers, so the log
+    file keeps a single writer.
+    """
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(level)
+
+
+def _process_file_worker(input_file: Path, output_dir: Path, config: Dict[str, Any]) -> Path:
+    """
+    Process a single file in a worker process.
+    
+    Defined at module level so it can be pickled by ProcessPoolExecutor.
+    """
+    return ExcelProcessor().process_file(input_file, output_dir, config)
+
 
 class ExcelProcessor:
     """Core Excel file processing class."""
@@ -49,22 +127,25 @@ class ExcelProcessor:
             self.logger.info(f"Reading file: {file_path}")
             
             if file_path.suffix.lower() == '.xls':
-                # Handle legacy XLS files - try to find header row
-                df_raw = pd.read_excel(file_path, engine='xlrd', header=None)
-                
-                # Look for header row with common Excel column patterns
-                header_row = self._find_header_row(df_raw)
-                
-                if header_row is not None:
-                    df = pd.read_excel(file_path, engine='xlrd', header=header_row)
-                    self.logger.info(f"Found headers at row {header_row}")
-                else:
-                    # Use first row as header if no patterns found
-                    df = pd.read_excel(file_path, engine='xlrd', header=0)
-                    self.logger.warning("Using first row as header")
+                # Handle legacy XLS files - parse once, peek at the top rows
+                # for the header, then hand the parsed workbook to pandas
+                book = xlrd.open_workbook(str(file_path))
+                try:
+                    # Look for header row with common Excel column patterns
+                    header_row = self._find_header_row(self._peek_rows(book))
+                    
+                    if header_row is not None:
+                        df = pd.read_excel(book, engine='xlrd', header=header_row)
+                        self.logger.info(f"Found headers at row {header_row}")
+                    else:
+                        # Use first row as header if no patterns found
+                        df = pd.read_excel(book, engine='xlrd', header=0)
+                        self.logger.warning("Using first row as header")
+                finally:
+                    book.release_resources()
                     
             elif file_path.suffix.lower() in ['.xlsx', '.xlsm']:
-                df = pd.read_excel(file_path, engine='openpyxl')
+                df = pd.read_excel(file_path, engine=XLSX_READ_ENGINE)
             else:
                 raise ValueError(f"Unsupported file format: {file_path.suffix}")
             
@@ -78,12 +159,26 @@ class ExcelProcessor:
             self.logger.error(f"Error reading file {file_path}: {str(e)}")
             raise
             
-    def _find_header_row(self, df_raw: pd.DataFrame) -> Optional[int]:
+    def _peek_rows(self, book: xlrd.book.Book, n: int = 21) -> List[List[Any]]:
+        """
+        Read the top rows of the first sheet as raw cell values.
+        
+        Args:
+            book: Parsed legacy workbook
+            n: Maximum number of rows to read
+            
+        Returns:
+            List of rows, with empty cells as ''
+        """
+        sheet = book.sheet_by_index(0)
+        return [sheet.row_values(row_idx) for row_idx in range(min(n, sheet.nrows))]
+        
+    def _find_header_row(self, rows: List[List[Any]]) -> Optional[int]:
         """
-        Find the header row in a raw DataFrame by looking for common patterns.
+        Find the header row among the top rows by looking for common patterns.
         
         Args:
-            df_raw: Raw DataFrame without headers
+            rows: Raw cell values of the top rows, empty cells as ''
             
         Returns:
             Row index of headers, or None if not found
@@ -94,12 +189,10 @@ class ExcelProcessor:
             'tax', 'social', 'security', 'medicare', 'federal', 'state'
         ]
         
-        for idx, row in df_raw.iterrows():
-            if idx > 20:  # Don't search too far down
-                break
-                
+        # Don't search too far down
+        for idx, row in enumerate(rows[:21]):
             # Convert row to string and check for keywords
-            row_str = ' '.join([str(cell).lower() for cell in row if pd.notna(cell)])
+            row_str = ' '.join([str(cell) for cell in row if cell != '']).lower()
             
             # Count matches
             matches = sum(1 for keyword in header_keywords if keyword in row_str)
@@ -140,30 +233,35 @@ class ExcelProcessor:
                 # Apply different mapping types
                 if source_column.startswith("="):
                     # Formula mapping
-                    output_data[col_name] = self._evaluate_formula(
+                    values = self._evaluate_formula(
                         source_column, filtered_input_df, output_data, col_config
                     )
                 elif source_column == "":
                     # Blank column
-                    output_data[col_name] = [""] * len(filtered_input_df)
+                    values = [""] * len(filtered_input_df)
                 else:
                     # Direct column mapping
-                    output_data[col_name] = self._map_column(
+                    values = self._map_column(
                         source_column, filtered_input_df, col_config
                     )
                     
-            result_df = pd.DataFrame(output_data)
-            
-            # Apply column ordering if specified
+                # Store as arrays so later formulas read contiguous numeric memory
+                output_data[col_name] = self._column_array(values)
+                    
+            # Apply column ordering if specified, before building the DataFrame
+            # so columns aren't copied a second time by reselection
             column_order = config.get("column_order", [])
             if column_order:
                 # Filter to only include columns that exist in the result
-                valid_order = [col for col in column_order if col in result_df.columns]
+                valid_order = list(dict.fromkeys(col for col in column_order if col in output_data))
                 # Add any remaining columns that weren't in the order
-                remaining_cols = [col for col in result_df.columns if col not in valid_order]
+                ordered = set(valid_order)
+                remaining_cols = [col for col in output_data if col not in ordered]
                 final_order = valid_order + remaining_cols
-                result_df = result_df[final_order]
+                output_data = {col: output_data[col] for col in final_order}
                 self.logger.info(f"Applied column ordering: {final_order}")
+                
+            result_df = pd.DataFrame(output_data)
             
             self.logger.info(f"Mapping applied successfully. Output shape: {result_df.shape}")
             return result_df
@@ -173,7 +271,7 @@ class ExcelProcessor:
             raise
             
     def _evaluate_formula(self, formula: str, input_df: pd.DataFrame, 
-                         output_data: Dict[str, List], col_config: Dict[str, Any]) -> List[Any]:
+                         output_data: Dict[str, np.ndarray], col_config: Dict[str, Any]) -> Union[np.ndarray, List[Any]]:
         """
         Evaluate Excel-style formula.
         
@@ -184,42 +282,48 @@ class ExcelProcessor:
             col_config: Column configuration
             
         Returns:
-            List of calculated values
+            Array or list of calculated values
         """
         try:
-            result = []
             formula_clean = formula[1:].strip()  # Remove '='
             self.logger.info(f"Evaluating formula: {formula_clean}")
             
-            for idx, row in input_df.iterrows():
+            # Resolve referenced input columns once instead of per row
+            words = self._find_formula_words(formula_clean)
+            name_map = self._build_name_map(input_df.columns, words)
+            expression, operands = self._replace_formula_symbols(
+                formula_clean, words, name_map, input_df, output_data
+            )
+            
+            # Parse and validate once; every row reuses the compiled code
+            try:
+                code = self._compile_formula(expression, operands)
+            except (SyntaxError, ValueError) as e:
+                self.logger.warning(f"Unsafe expression {expression}: {e}")
+                return [0] * len(input_df)
+            
+            # Evaluate once over whole columns when possible
+            vectorized = self._evaluate_formula_vectorized(code, operands, len(input_df))
+            if vectorized is not None:
+                return vectorized
+            
+            result = [0] * len(input_df)
+            for idx in range(len(input_df)):
                 try:
-                    # Replace column references with actual values
-                    evaluated_formula = self._replace_formula_references(
-                        formula_clean, row, output_data, idx
-                    )
+                    values = {
+                        symbol: self._scalar_operand(operand[idx])
+                        for symbol, operand in operands.items()
+                    }
                     
                     # Debug logging for first few rows
-                    if idx < 3:
-                        self.logger.info(f"Row {idx}: Original: {formula_clean}, Evaluated: {evaluated_formula}")
+                    if idx < 3 and self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug("Row %d: Expression: %s, Values: %s", idx, expression, values)
                     
-                    # Safely evaluate the formula
-                    if self._is_safe_expression(evaluated_formula):
-                        calculated_value = eval(evaluated_formula)
-                        result.append(calculated_value)
-                    else:
-                        # Try to fix common issues with quotes
-                        fixed_formula = evaluated_formula.replace('"', '')
-                        if self._is_safe_expression(fixed_formula):
-                            self.logger.info(f"Fixed expression for row {idx}: {fixed_formula}")
-                            calculated_value = eval(fixed_formula)
-                            result.append(calculated_value)
-                        else:
-                            self.logger.warning(f"Unsafe expression for row {idx}: {evaluated_formula}")
-                            result.append(0)
+                    result[idx] = eval(code, {"__builtins__": {}}, values)
                         
                 except Exception as e:
+                    # Row keeps its preallocated 0
                     self.logger.warning(f"Error evaluating formula for row {idx}: {e}")
-                    result.append(0)
                     
             return result
             
@@ -227,108 +331,204 @@ class ExcelProcessor:
             self.logger.error(f"Error evaluating formula {formula}: {str(e)}")
             return [0] * len(input_df)
             
-    def _replace_formula_references(self, formula: str, row: pd.Series, 
-                                   output_data: Dict[str, List], row_idx: int) -> str:
+    def _compile_formula(self, expression: str, operands: Dict[str, Any]):
+        """
+        Parse, validate and compile an arithmetic formula expression.
+        
+        Args:
+            expression: Expression with column references replaced by placeholders
+            operands: Placeholder to operand values map
+            
+        Returns:
+            Compiled code object
+            
+        Raises:
+            SyntaxError: If the expression can't be parsed
+            ValueError: If the expression uses anything beyond arithmetic
+        """
+        if not self._is_safe_expression(expression):
+            raise ValueError("disallowed characters")
+            
+        tree = ast.parse(expression, mode='eval')
+        _FormulaValidator(operands).visit(tree)
+        return compile(tree, '<formula>', 'eval')
+        
+    def _evaluate_formula_vectorized(self, code, operands: Dict[str, Any], row_count: int) -> Optional[np.ndarray]:
+        """
+        Evaluate compiled formula once over whole column arrays.
+        
+        Args:
+            code: Compiled formula expression
+            operands: Placeholder to operand values map
+            row_count: Number of rows to produce
+            
+        Returns:
+            Array of calculated values, or None if the formula can't be vectorized
+        """
+        try:
+            # Previously calculated columns must be numeric to vectorize
+            arrays = {symbol: np.asarray(operand, dtype=float) for symbol, operand in operands.items()}
+            
+            with np.errstate(all='ignore'):
+                values = np.asarray(eval(code, {"__builtins__": {}}, arrays))
+                
+            if values.dtype.kind not in 'biuf':
+                return None
+            values = np.broadcast_to(values, (row_count,))
+            
+            # Division by zero and similar errors evaluate to 0, as in the row loop
+            if values.dtype.kind == 'f':
+                values = np.where(np.isfinite(values), values, 0.0)
+                
+            return np.ascontiguousarray(values)
+            
+        except Exception as e:
+            self.logger.info(f"Falling back to row-by-row evaluation: {e}")
+            return None
+            
+    def _scalar_operand(self, value) -> float:
+        """
+        Convert a single operand value for row-by-row evaluation.
+        
+        Raises:
+            ValueError: If the value isn't a finite number
+        """
+        if isinstance(value, (bool, np.bool_)) or not isinstance(value, (int, float, str, np.number)):
+            raise ValueError(f"Non-numeric value: {value!r}")
+        number = float(value)
+        if not np.isfinite(number):
+            raise ValueError(f"Non-numeric value: {value!r}")
+        return number
+            
+    def _replace_formula_symbols(self, formula: str, words: List[str], name_map: Dict[str, Any],
+                                 input_df: pd.DataFrame,
+                                 output_data: Dict[str, np.ndarray]) -> Tuple[str, Dict[str, Any]]:
         """
-        Replace column references in formula with actual values.
+        Replace column references in formula with placeholder identifiers.
         
         Args:
             formula: Formula string
-            row: Current row data
+            words: Column references found in formula
+            name_map: Reference to input column label map
+            input_df: Input DataFrame
             output_data: Current output data
-            row_idx: Current row index
             
         Returns:
-            Formula with replaced values
+            Tuple of (formula with placeholders, placeholder to operand values map)
+        """
+        operands = {}
+        replacements = {}
+        
+        for word_clean in words:
+            # Try to find matching column in input data first
+            if word_clean in name_map:
+                values = self._to_numeric(input_df[name_map[word_clean]])
+            elif word_clean in output_data:
+                # Previously calculated columns
+                values = output_data[word_clean]
+            else:
+                self.logger.warning(f"No value found for '{word_clean}'")
+                continue
+                
+            symbol = f"_c{len(operands)}"
+            operands[symbol] = values
+            replacements[word_clean] = symbol
+            
+        replaced_formula = self._substitute_references(formula, replacements)
+        
+        # Quoted column names are references, not strings
+        return replaced_formula.replace('"', ''), operands
+        
+    def _find_formula_words(self, formula: str) -> List[str]:
         """
-        # Find all column references (words that could be column names)
-        # This is a simplified approach - could be made more sophisticated
-        import re
+        Find candidate column references in formula.
         
+        Args:
+            formula: Formula string
+            
+        Returns:
+            List of referenced names, excluding operators and functions
+        """
         # Look for column names - handle names with spaces and hyphens
         # First try to find quoted column names
-        quoted_names = re.findall(r'"([^"]+)"', formula)
+        quoted_names = _QUOTED_RE.findall(formula)
         # Then find unquoted column names (words with spaces, hyphens, etc.)
-        unquoted_names = re.findall(r'\b[A-Za-z][A-Za-z0-9_\s\-]*[A-Za-z0-9_]\b', formula)
+        unquoted_names = _UNQUOTED_RE.findall(formula)
         
         # Combine and deduplicate
         words = list(set(quoted_names + unquoted_names))
-        self.logger.info(f"Found words in formula: {words}")
+        self.logger.debug("Found words in formula: %s", words)
         
-        replaced_formula = formula
+        # Skip common operators and functions
+        return [
+            word.strip() for word in words
+            if word.strip().lower() not in ['and', 'or', 'not', 'abs', 'sum', 'avg', 'max', 'min']
+        ]
         
-        for word in words:
-            word_clean = word.strip()
-            
-            # Skip common operators and functions
-            if word_clean.lower() in ['and', 'or', 'not', 'abs', 'sum', 'avg', 'max', 'min']:
-                continue
-                
-            # Try to find matching column in input data first
-            value = self._find_column_value(word_clean, row)
+    def _substitute_references(self, formula: str, replacements: Dict[str, str]) -> str:
+        """
+        Replace column references in formula in a single pass.
+        
+        Args:
+            formula: Formula string
+            replacements: Column reference to replacement text map
             
-            # If not found in input data, try output data (previously calculated columns)
-            if value is None and word_clean in output_data:
-                try:
-                    value = output_data[word_clean][row_idx]
-                    self.logger.info(f"Found value for '{word_clean}' in output data: {value}")
-                except (IndexError, KeyError):
-                    value = None
-            
-            if value is not None:
-                self.logger.info(f"Found value for '{word_clean}': {value}")
-                # Replace the word with the numeric value
-                # Use word boundaries for simple names, or exact match for complex names
-                if ' ' in word_clean or '-' in word_clean:
-                    # For names with spaces or hyphens, use exact match
-                    replaced_formula = replaced_formula.replace(word_clean, str(value))
-                else:
-                    # For simple names, use word boundaries
-                    replaced_formula = re.sub(
-                        r'\b' + re.escape(word_clean) + r'\b', 
-                        str(value), 
-                        replaced_formula
-                    )
-            else:
-                self.logger.warning(f"No value found for '{word_clean}'")
-                
-        return replaced_formula
+        Returns:
+            Formula with all references replaced
+        """
+        if not replacements:
+            return formula
+            
+        # Use word boundaries for simple names, or exact match for names with spaces or hyphens;
+        # longest names first so a short name never claims part of a longer one
+        alternatives = [
+            re.escape(word) if (' ' in word or '-' in word) else r'\b' + re.escape(word) + r'\b'
+            for word in sorted(replacements, key=len, reverse=True)
+        ]
+        pattern = re.compile('|'.join(alternatives))
+        return pattern.sub(lambda match: replacements[match.group(0)], formula)
         
-    def _find_column_value(self, col_name: str, row: pd.Series) -> Optional[float]:
+    def _build_name_map(self, columns: pd.Index, requested: List[str]) -> Dict[str, Any]:
         """
-        Find column value in row, with fuzzy matching.
+        Resolve requested names against available columns, with fuzzy matching.
         
         Args:
-            col_name: Column name to find
-            row: Row data
+            columns: Available column labels
+            requested: Column names to find
             
         Returns:
-            Numeric value or None if not found
+            Map of requested name to matching column label; unmatched names are omitted
         """
-        # Direct match
-        if col_name in row.index:
-            return self._to_numeric(row[col_name])
-            
-        # Case-insensitive match
-        for col in row.index:
-            if str(col).lower() == col_name.lower():
-                return self._to_numeric(row[col])
+        lowered = [(col, str(col).lower()) for col in columns]
+        name_map = {}
+        
+        for col_name in requested:
+            # Direct match
+            if col_name in columns:
+                name_map[col_name] = col_name
+                continue
+                
+            name_lower = col_name.lower()
+            
+            # Case-insensitive match, then partial match
+            match = next((col for col, col_lower in lowered if col_lower == name_lower), None)
+            if match is None:
+                match = next(
+                    (col for col, col_lower in lowered if name_lower in col_lower or col_lower in name_lower),
+                    None
+                )
                 
-        # Partial match
-        for col in row.index:
-            if col_name.lower() in str(col).lower() or str(col).lower() in col_name.lower():
-                return self._to_numeric(row[col])
+            if match is not None:
+                name_map[col_name] = match
                 
-        return None
+        return name_map
         
-    def _to_numeric(self, value) -> float:
-        """Convert value to numeric, returning 0 if conversion fails."""
-        try:
-            if pd.isna(value):
-                return 0.0
-            return float(value)
-        except (ValueError, TypeError):
-            return 0.0
+    def _to_numeric(self, values: pd.Series) -> np.ndarray:
+        """Convert column to numeric, returning 0 where conversion fails."""
+        # Dates and durations aren't numeric operands
+        if values.dtype.kind in 'mM':
+            return np.zeros(len(values))
+        return pd.to_numeric(values, errors='coerce').fillna(0).to_numpy(dtype=float)
             
     def _is_safe_expression(self, expr: str) -> bool:
         """
@@ -340,12 +540,8 @@ class ExcelProcessor:
         Returns:
             True if expression is safe
         """
-        # Only allow basic arithmetic and numbers
-        allowed_chars = set('0123456789+-*/()._ ')
-        return all(c in allowed_chars for c in expr) and not any(
-            dangerous in expr.lower() 
-            for dangerous in ['import', 'exec', 'eval', '__', 'open', 'file']
-        )
+        # Only allow basic arithmetic, numbers and placeholder names
+        return bool(_SAFE_RE.fullmatch(expr)) and not _DANGER_RE.search(expr)
         
             
     def _map_column(self, source_column: str, input_df: pd.DataFrame, col_config: Dict[str, Any] = None) -> List[Any]:
@@ -369,13 +565,31 @@ class ExcelProcessor:
                 
                 # Remove asterisks if enabled
                 if formatting.get("remove_asterisks", False):
-                    values = [str(value).replace("*", "") if pd.notna(value) else value for value in values]
+                    series = input_df[source_column]
+                    mask = series.notna()
+                    cleaned = series[mask].astype(object).map(str).str.replace("*", "", regex=False)
+                    values = series.astype(object).where(~mask, cleaned).tolist()
             
             return values
         else:
             self.logger.warning(f"Column '{source_column}' not found in input data")
             return [""] * len(input_df)
             
+    def _column_array(self, values: Union[np.ndarray, List[Any]]) -> np.ndarray:
+        """
+        Convert mapped column values to a NumPy array.
+        
+        Args:
+            values: Mapped or calculated column values
+            
+        Returns:
+            Array with the dtype pandas would infer for the values
+        """
+        if isinstance(values, np.ndarray):
+            return values
+        # Let pandas infer the dtype so the DataFrame built later matches list input
+        return pd.Series(values).to_numpy()
+        
     def _apply_void_filtering(self, df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
         """
         Apply void filtering to remove rows where specified columns are all zero.
@@ -406,27 +620,27 @@ class ExcelProcessor:
                 
             self.logger.info(f"Applying void filtering on input columns: {existing_columns}")
             
-            # Debug: Show sample values from the columns being checked
-            for col in existing_columns:
-                sample_values = df[col].head(10).tolist()
-                self.logger.info(f"Sample values from '{col}': {sample_values}")
+            # Convert all checked columns in one block
+            numeric_block = df[existing_columns].apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy()
+            zero_block = numeric_block == 0
             
-            # Create mask for rows where all specified columns are zero
-            mask = pd.Series([True] * len(df))
+            if self.logger.isEnabledFor(logging.DEBUG):
+                # Debug: Show sample values and zero counts for the columns being checked
+                for pos, col in enumerate(existing_columns):
+                    self.logger.debug(f"Sample values from '{col}': {df[col].head(10).tolist()}")
+                    self.logger.debug(f"Column '{col}': {zero_block[:, pos].sum()} zero values out of {len(df)} rows")
             
-            for col in existing_columns:
-                numeric_col = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                col_mask = (numeric_col == 0)
-                self.logger.info(f"Column '{col}': {col_mask.sum()} zero values out of {len(df)} rows")
-                mask = mask & col_mask
+            # Create mask for rows where all specified columns are zero
+            mask = zero_block.all(axis=1)
                 
             # Count and remove void rows
-            void_rows = mask.sum()
+            void_rows = int(mask.sum())
             if void_rows > 0:
                 self.logger.info(f"Removing {void_rows} void rows from input data")
-                # Debug: Show which rows are being removed
-                void_row_indices = df[mask].index.tolist()[:10]  # Show first 10
-                self.logger.info(f"Sample void row indices: {void_row_indices}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    # Debug: Show which rows are being removed
+                    void_row_indices = df.index[mask].tolist()[:10]  # Show first 10
+                    self.logger.debug(f"Sample void row indices: {void_row_indices}")
                 return df[~mask].copy()
             else:
                 self.logger.info("No void rows found in input data")
@@ -472,10 +686,72 @@ class ExcelProcessor:
             self.logger.error(f"Error processing file: {str(e)}")
             raise
             
+    def process_files(self, input_files: List[Path], output_dir: Path, config: Dict[str, Any],
+                      max_workers: Optional[int] = None) -> List[Path]:
+        """
+        Process several files in parallel worker processes.
+        
+        Files that fail are logged and skipped so the rest of the batch
+        still completes.
+        
+        Args:
+            input_files: Paths to input files
+            output_dir: Output directory path
+            config: Processing configuration
+            max_workers: Maximum worker processes (defaults to CPU count)
+            
+        Returns:
+            Paths to generated output files, in input order
+        """
+        # Starting worker processes isn't worth it for a single file
+        if len(input_files) <= 1 or max_workers == 1:
+            output_files = []
+            for input_file in input_files:
+                try:
+                    output_files.append(self.process_file(input_file, output_dir, config))
+                except Exception as e:
+                    self.logger.error(f"Error processing file {input_file.name}: {str(e)}")
+            return output_files
+            
+        # Spawn rather than fork: the caller may be the multithreaded Tk GUI,
+        # and a forked copy of it can deadlock
+        mp_context = multiprocessing.get_context("spawn")
+        root_logger = logging.getLogger()
+        log_queue = mp_context.Queue()
+        listener = QueueListener(log_queue, *root_logger.handlers, respect_handler_level=True)
+        listener.start()
+        
+        results = {}
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=mp_context,
+                initializer=_init_worker_logging,
+                initargs=(log_queue, root_logger.getEffectiveLevel())
+            ) as executor:
+                futures = {
+                    executor.submit(_process_file_worker, input_file, output_dir, config): input_file
+                    for input_file in input_files
+                }
+                for future in as_completed(futures):
+                    input_file = futures[future]
+                    try:
+                        results[input_file] = future.result()
+                        self.logger.info(f"Successfully processed: {input_file.name}")
+                    except Exception as e:
+                        self.logger.error(f"Error processing file {input_file.name}: {str(e)}")
+        finally:
+            listener.stop()
+            
+        return [results[input_file] for input_file in input_files if input_file in results]
+        
     def save_formatted_output(self, df: pd.DataFrame, output_path: Path, config: Dict[str, Any]):
         """
         Save DataFrame to Excel with formatting applied.
         
+        The workbook is streamed in a single pass: column widths and sheet
+        settings are set first, then styled header and data rows are appended.
+        
         Args:
             df: DataFrame to save
             output_path: Output file path
@@ -484,15 +760,23 @@ class ExcelProcessor:
         try:
             self.logger.info(f"Saving formatted output to: {output_path}")
             
-            # Save basic Excel file
-            df.to_excel(output_path, index=False, engine='openpyxl')
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet(title="Sheet1")
             
-            # Apply formatting
+            # Prepare formatting - column and sheet settings must precede rows
             try:
-                self.apply_excel_formatting(output_path, df, config)
+                header_row = self._format_headers(ws, df, config)
+                column_styles = self._format_columns(ws, df, config)
+                self._apply_general_settings(ws, config)
             except Exception as e:
-                self.logger.warning(f"Excel formatting failed, but file was saved: {str(e)}")
+                self.logger.warning(f"Excel formatting failed, saving without formatting: {str(e)}")
                 # Continue without formatting
+                header_row = list(df.columns)
+                column_styles = []
+            
+            ws.append(header_row)
+            self._write_data_rows(ws, df, column_styles)
+            wb.save(output_path)
             
             self.logger.info("Formatted output saved successfully")
             
@@ -500,37 +784,8 @@ class ExcelProcessor:
             self.logger.error(f"Error saving formatted output: {str(e)}")
             raise
             
-    def apply_excel_formatting(self, output_path: Path, df: pd.DataFrame, config: Dict[str, Any]):
-        """
-        Apply Excel formatting to the saved file.
-        
-        Args:
-            output_path: Path to Excel file
-            df: DataFrame that was saved
-            config: Formatting configuration
-        """
-        try:
-            wb = load_workbook(output_path)
-            ws = wb.active
-            
-            # Apply header formatting
-            self._format_headers(ws, df, config)
-            
-            # Apply column formatting
-            self._format_columns(ws, df, config)
-            
-            # Apply general settings
-            self._apply_general_settings(ws, config)
-            
-            wb.save(output_path)
-            self.logger.info("Excel formatting applied successfully")
-            
-        except Exception as e:
-            self.logger.error(f"Error applying Excel formatting: {str(e)}")
-            raise
-            
-    def _format_headers(self, ws, df: pd.DataFrame, config: Dict[str, Any]):
-        """Apply header formatting."""
+    def _format_headers(self, ws, df: pd.DataFrame, config: Dict[str, Any]) -> List[WriteOnlyCell]:
+        """Build formatted header cells."""
         header_config = config.get("header_formatting", {})
         
         # Header styling
@@ -550,33 +805,49 @@ class ExcelProcessor:
             vertical="center"
         )
         
-        # Apply to header row
-        for col_num in range(1, len(df.columns) + 1):
-            cell = ws.cell(row=1, column=col_num)
+        # Apply to header row; the style objects are shared by every cell
+        header_row = []
+        for col_name in df.columns:
+            cell = WriteOnlyCell(ws, value=col_name)
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = header_alignment
+            header_row.append(cell)
             
-    def _format_columns(self, ws, df: pd.DataFrame, config: Dict[str, Any]):
-        """Apply column-specific formatting."""
+        return header_row
+            
+    def _format_columns(self, ws, df: pd.DataFrame, config: Dict[str, Any]) -> List[Tuple[Alignment, Optional[str]]]:
+        """
+        Apply column widths and collect column-specific cell formatting.
+        
+        Returns:
+            List of (alignment, number format) per formatted column
+        """
         try:
             output_columns = config.get("output_columns", [])
             self.logger.info(f"Formatting {len(output_columns)} columns for DataFrame with {len(df.columns)} columns")
-            self.logger.info(f"DataFrame columns: {list(df.columns)}")
-            self.logger.info(f"DataFrame shape: {df.shape}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("DataFrame columns: %s", list(df.columns))
+                self.logger.debug("DataFrame shape: %s", df.shape)
+            
+            column_styles = []
+            
+            # Measure sampled content once for all auto-fitted columns
+            general_config = config.get("general_settings", {})
+            auto_fit = general_config.get("auto_fit_columns", True)
+            content_widths = self._sample_content_widths(df) if auto_fit else []
             
             for col_idx, col_config in enumerate(output_columns, 1):
-                self.logger.info(f"Processing column {col_idx}: {col_config.get('name', 'Unknown')}")
+                self.logger.debug("Processing column %d: %s", col_idx, col_config.get('name', 'Unknown'))
                 
                 if col_idx > len(df.columns):
                     self.logger.warning(f"Column index {col_idx} exceeds DataFrame columns {len(df.columns)}")
                     break
                 
                 # Column width - auto-fit if enabled, otherwise use configured width
-                general_config = config.get("general_settings", {})
-                if general_config.get("auto_fit_columns", True):
+                if auto_fit:
                     # Auto-fit column width
-                    self._auto_fit_column(ws, df, col_idx)
+                    self._auto_fit_column(ws, df, col_idx, content_widths)
                 else:
                     # Use configured width
                     width = col_config.get("width", 15)
@@ -587,20 +858,10 @@ class ExcelProcessor:
                     horizontal=col_config.get("alignment", "left"),
                     vertical="center"
                 )
+                number_format = col_config.get("formatting", {}).get("number_format")
+                column_styles.append((alignment, number_format))
                 
-                # Apply to data rows
-                for row_num in range(2, len(df) + 2):
-                    try:
-                        cell = ws.cell(row=row_num, column=col_idx)
-                        cell.alignment = alignment
-                        
-                        # Apply number formatting
-                        formatting = col_config.get("formatting", {})
-                        if "number_format" in formatting:
-                            cell.number_format = formatting["number_format"]
-                    except Exception as cell_error:
-                        self.logger.error(f"Error processing cell row {row_num}, col {col_idx}: {str(cell_error)}")
-                        raise
+            return column_styles
                             
         except Exception as e:
             self.logger.error(f"Error in _format_columns: {str(e)}")
@@ -608,9 +869,68 @@ class ExcelProcessor:
             import traceback
             self.logger.error(f"Traceback: {traceback.format_exc()}")
             raise
+            
+    def _write_data_rows(self, ws, df: pd.DataFrame, column_styles: List[Tuple[Alignment, Optional[str]]]):
+        """
+        Append data rows, styling cells of formatted columns.
+        
+        Args:
+            ws: Write-only worksheet
+            df: DataFrame to write
+            column_styles: (alignment, number format) per formatted column
+        """
+        # Missing values are written as empty cells
+        values = df.to_numpy(dtype=object, copy=True)
+        values[pd.isna(values)] = None
+        
+        for row in values:
+            cells = []
+            for col_pos, value in enumerate(row.tolist()):
+                styled = col_pos < len(column_styles)
+                if not styled and not isinstance(value, date):
+                    cells.append(value)
+                    continue
+                    
+                cell = WriteOnlyCell(ws, value=value)
+                
+                number_format = None
+                if styled:
+                    alignment, number_format = column_styles[col_pos]
+                    cell.alignment = alignment
+                    if number_format is not None:
+                        cell.number_format = number_format
+                        
+                # Match pandas' default date formats unless the column sets one
+                if number_format is None:
+                    if isinstance(value, datetime):
+                        cell.number_format = "YYYY-MM-DD HH:MM:SS"
+                    elif isinstance(value, date):
+                        cell.number_format = "YYYY-MM-DD"
+                cells.append(cell)
+                
+            ws.append(cells)
     
-    def _auto_fit_column(self, ws, df: pd.DataFrame, col_idx: int):
-        """Auto-fit column width based on content."""
+    def _sample_content_widths(self, df: pd.DataFrame) -> List[int]:
+        """
+        Measure the longest text value per column.
+        
+        Args:
+            df: DataFrame to measure
+            
+        Returns:
+            Longest written text length per column position, limited to the first 100 rows for performance
+        """
+        sample = df.head(100)
+        if sample.empty:
+            return [0] * len(df.columns)
+            
+        return [
+            int(sample.iloc[:, pos].map(_cell_text).str.len().max())
+            for pos in range(len(sample.columns))
+        ]
+        
+    def _auto_fit_column(self, ws, df: pd.DataFrame, col_idx: int, content_widths: List[int]):
+        """Auto-fit column width based on sampled content widths."""
         try:
             column_letter = get_column_letter(col_idx)
             
@@ -622,24 +942,14 @@ class ExcelProcessor:
                 
             col_name = df.columns[col_idx - 1]
             
-            # Calculate max width needed
-            max_width = len(str(col_name))  # Header width
-            
-            # Check data rows - limit to first 100 rows for performance
-            sample_size = min(len(df), 100)
-            for row_idx in range(sample_size):
-                try:
-                    cell_value = str(df.iloc[row_idx, col_idx - 1])
-                    max_width = max(max_width, len(cell_value))
-                except (IndexError, KeyError) as e:
-                    self.logger.warning(f"Error accessing row {row_idx}, col {col_idx}: {str(e)}")
-                    continue
+            # Calculate max width needed from header and data rows
+            max_width = max(len(str(col_name)), content_widths[col_idx - 1])
             
             # Add some padding and set reasonable limits
             adjusted_width = min(max(max_width + 2, 8), 50)  # Min 8, Max 50
             ws.column_dimensions[column_letter].width = adjusted_width
             
-            self.logger.info(f"Auto-fitted column {col_name} to width {adjusted_width}")
+            self.logger.debug("Auto-fitted column %s to width %s", col_name, adjusted_width)
             
         except Exception as e:
             self.logger.warning(f"Error auto-fitting column {col_idx}: {str(e)}")
@@ -9,19 +9,49 @@ Author: Assistant
 Date: 2025
 """
 
-import pandas as pd
-import openpyxl
-from openpyxl import load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-import xlrd
+from __future__ import annotations
+
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
 import logging
-from datetime import datetime
+from datetime import date, datetime
+import ast
+import importlib.metadata
+import importlib.util
+import operator
+import re
 import sys
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def _lazy_import(name: str):
+    """Import a module when one of its attributes is first used."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Heavy dependencies load on first use, so a run with no input files skips them
+np = _lazy_import("numpy")
+pd = _lazy_import("pandas")
+openpyxl = _lazy_import("openpyxl")
+xlrd = _lazy_import("xlrd")
+
+# Rust-based calamine reader for .xlsx/.xlsm/.xlsb when installed (pandas >= 2.2)
+_PANDAS_VERSION = tuple(int(part) for part in importlib.metadata.version("pandas").split(".")[:2])
+XLSX_READ_ENGINE = (
+    'calamine' if importlib.util.find_spec("python_calamine") is not None and _PANDAS_VERSION >= (2, 2)
+    else 'openpyxl'
+)
+XLSB_READ_ENGINE = 'calamine' if XLSX_READ_ENGINE == 'calamine' else 'pyxlsb'
 
 # Configure logging
 logging.basicConfig(
@@ -34,13 +64,55 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Map formula column names to actual data
+FORMULA_COLUMN_MAPPING = {
+    "Chk Amt": "Net pay",
+    "Gross": "Adjusted gross",
+    "Fica": "Employee taxes - SS + Employee taxes - Med"
+}
+
+# Formula column names as whole words, longest first so no name claims part of another
+_FORMULA_NAME_RE = re.compile(
+    r'\b(' + '|'.join(re.escape(name) for name in sorted(FORMULA_COLUMN_MAPPING, key=len, reverse=True)) + r')\b'
+)
+
+# Payroll header detection: terms found anywhere in a row, or cells that are headers on their own
+HEADER_KEYWORDS = ['employee name', 'net pay', 'gross pay', 'pay date', 'time period', 'social security', 'medicare']
+HEADER_CELLS = ['name', 'employee', 'pay', 'gross', 'net', 'date', 'period']
+_HEADER_KEYWORD_RE = re.compile('|'.join(re.escape(keyword) for keyword in HEADER_KEYWORDS))
+
+# Rows read when first looking for the header row
+HEADER_SCAN_ROWS = 50
+
+# Smaller batches finish serially before worker processes would pay off
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+# Arithmetic supported when evaluating formulas over whole columns
+_FORMULA_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg
+}
+
+# openpyxl writes floats with 16 significant digits, not their repr
+_FLOAT_TEXT = "%.16g".__mod__
+
+
+def _cell_text(value: Any) -> str:
+    """Text of a value as openpyxl writes it into the sheet."""
+    return _FLOAT_TEXT(value) if isinstance(value, float) else str(value)
+
 
 class ExcelFormatter:
     """Main class for Excel file formatting operations."""
     
     def __init__(self, input_dir: str = "../input_files", 
                  template_dir: str = "../template_files", 
-                 output_dir: str = "../output_files"):
+                 output_dir: str = "../output_files",
+                 config: Optional[Dict[str, Any]] = None):
         """
         Initialize the Excel formatter.
         
@@ -48,18 +120,25 @@ class ExcelFormatter:
             input_dir: Directory containing input Excel files
             template_dir: Directory containing template Excel files
             output_dir: Directory for output files
+            config: Already loaded configuration; the directories are then
+                assumed to exist and mapping_config.json is not read
         """
         self.input_dir = Path(input_dir)
         self.template_dir = Path(template_dir)
         self.output_dir = Path(output_dir)
         
-        # Ensure directories exist
-        self.input_dir.mkdir(exist_ok=True)
-        self.template_dir.mkdir(exist_ok=True)
-        self.output_dir.mkdir(exist_ok=True)
+        if config is None:
+            # Ensure directories exist
+            self.input_dir.mkdir(exist_ok=True)
+            self.template_dir.mkdir(exist_ok=True)
+            self.output_dir.mkdir(exist_ok=True)
+            
+            # Load configuration from external file
+            config = self.load_configuration()
+        self.config = config
         
-        # Load configuration from external file
-        self.config = self.load_configuration()
+        # Template analysis keyed by (path, modification time)
+        self._template_cache: Dict[Tuple[str, int], Dict[str, Any]] = {}
         
         logger.info("ExcelFormatter initialized successfully")
     
@@ -112,33 +191,32 @@ class ExcelFormatter:
             logger.info(f"Reading file: {file_path}")
             
             if file_path.suffix.lower() == '.xls':
-                # Try to find the header row by looking for common payroll column names
-                df_raw = pd.read_excel(file_path, engine='xlrd', header=None)
-                
-                # Look for a row that contains common payroll headers
-                header_row = None
-                for idx, row in df_raw.iterrows():
-                    row_str = ' '.join([str(cell) for cell in row if pd.notna(cell)]).lower()
-                    # Look for more specific payroll terms
-                    if any(keyword in row_str for keyword in ['employee name', 'net pay', 'gross pay', 'pay date', 'time period', 'social security', 'medicare']):
-                        header_row = idx
-                        logger.info(f"Found potential header row {idx} with content: {row_str[:100]}")
-                        break
-                    # Also check for individual cells that might be headers
-                    elif any(str(cell).lower() in ['name', 'employee', 'pay', 'gross', 'net', 'date', 'period'] for cell in row if pd.notna(cell)):
-                        header_row = idx
-                        logger.info(f"Found potential header row {idx} with individual headers")
-                        break
-                
-                if header_row is not None:
-                    df = pd.read_excel(file_path, engine='xlrd', header=header_row)
-                    logger.info(f"Found headers at row {header_row}")
-                else:
-                    df = df_raw
-                    logger.warning("Could not find header row, using raw data")
+                # Parse the workbook once and build DataFrames from the open book
+                book = xlrd.open_workbook(str(file_path))
+                try:
+                    # Try to find the header row by looking for common payroll column names,
+                    # in the top rows first since headers are rarely deeper
+                    df_raw = pd.read_excel(book, engine='xlrd', header=None, nrows=HEADER_SCAN_ROWS)
+                    
+                    # Look for a row that contains common payroll headers
+                    header_row = self._find_header_row(df_raw)
+                    if header_row is None and len(df_raw) == HEADER_SCAN_ROWS:
+                        df_raw = pd.read_excel(book, engine='xlrd', header=None)
+                        header_row = self._find_header_row(df_raw)
+                    
+                    if header_row is not None:
+                        df = pd.read_excel(book, engine='xlrd', header=header_row)
+                        logger.info(f"Found headers at row {header_row}")
+                    else:
+                        df = df_raw
+                        logger.warning("Could not find header row, using raw data")
+                finally:
+                    book.release_resources()
                     
             elif file_path.suffix.lower() in ['.xlsx', '.xlsm']:
-                df = pd.read_excel(file_path, engine='openpyxl')
+                df = pd.read_excel(file_path, engine=XLSX_READ_ENGINE)
+            elif file_path.suffix.lower() == '.xlsb':
+                df = pd.read_excel(file_path, engine=XLSB_READ_ENGINE)
             else:
                 raise ValueError(f"Unsupported file format: {file_path.suffix}")
             
@@ -149,6 +227,44 @@ class ExcelFormatter:
             logger.error(f"Error reading file {file_path}: {str(e)}")
             raise
     
+    def _find_header_row(self, df_raw: pd.DataFrame, block_size: int = 50) -> Optional[int]:
+        """
+        Find the first row that looks like a payroll header row.
+        
+        Rows are scanned in blocks with vectorized string operations, so the
+        usual header near the top only costs one small block.
+        
+        Args:
+            df_raw: Sheet data read without a header
+            block_size: Number of rows scanned at a time
+            
+        Returns:
+            Index of the header row, or None if no row matches
+        """
+        for start in range(0, len(df_raw), block_size):
+            # Non-empty cells of the block as lowercase text, indexed by (row, column)
+            cells = df_raw.iloc[start:start + block_size].stack().dropna().map(str).str.lower()
+            if cells.empty:
+                continue
+            
+            row_text = cells.groupby(level=0).agg(' '.join)
+            # Look for more specific payroll terms
+            keyword_rows = row_text.str.contains(_HEADER_KEYWORD_RE).to_numpy()
+            # Also check for individual cells that might be headers
+            cell_rows = cells.isin(HEADER_CELLS).groupby(level=0).any().to_numpy()
+            
+            matches = (keyword_rows | cell_rows).nonzero()[0]
+            if len(matches):
+                position = matches[0]
+                idx = int(row_text.index[position])
+                if keyword_rows[position]:
+                    logger.info(f"Found potential header row {idx} with content: {row_text.iloc[position][:100]}")
+                else:
+                    logger.info(f"Found potential header row {idx} with individual headers")
+                return idx
+        
+        return None
+    
     def analyze_template(self, template_path: Path) -> Dict[str, Any]:
         """
         Analyze template file to understand its structure.
@@ -160,36 +276,52 @@ class ExcelFormatter:
             Dictionary containing template information
         """
         try:
-            logger.info(f"Analyzing template: {template_path}")
+            # Reuse the analysis while the template file is unchanged
+            cache_key = (str(template_path), template_path.stat().st_mtime_ns)
+            if cache_key in self._template_cache:
+                return self._template_cache[cache_key]
             
-            wb = load_workbook(template_path, data_only=False)
-            ws = wb.active
-            
-            # Get column headers from first row
-            headers = []
-            for cell in ws[1]:
-                if cell.value:
-                    headers.append(str(cell.value))
-                else:
-                    headers.append("")
-            
-            # Find formulas in the sheet
-            formulas = {}
-            for row in ws.iter_rows(min_row=2, max_row=min(10, ws.max_row)):
-                for cell in row:
-                    if cell.data_type == 'f' and cell.value:
-                        col_letter = cell.column_letter
-                        if col_letter not in formulas:
-                            formulas[col_letter] = cell.value
-            
-            template_info = {
-                "headers": headers,
-                "formulas": formulas,
-                "sheet_name": ws.title,
-                "max_row": ws.max_row,
-                "max_col": ws.max_column
-            }
+            logger.info(f"Analyzing template: {template_path}")
             
+            # Stream the sheet XML instead of building the full cell tree
+            wb = openpyxl.load_workbook(template_path, data_only=False, read_only=True, keep_links=False)
+            try:
+                ws = wb.active
+                
+                # Read-only sheets rely on the stored dimensions; scan once if they're missing
+                if ws.max_row is None or ws.max_column is None:
+                    ws.calculate_dimension(force=True)
+                
+                # Get column headers from first row
+                headers = []
+                for row in ws.iter_rows(min_row=1, max_row=1, max_col=ws.max_column, values_only=True):
+                    for value in row:
+                        if value:
+                            headers.append(str(value))
+                        else:
+                            headers.append("")
+                
+                # Find formulas in the first rows; the iterator stops early on shorter sheets
+                formulas = {}
+                for row in ws.iter_rows(min_row=2, max_row=10, values_only=True):
+                    for col_idx, value in enumerate(row, 1):
+                        if isinstance(value, str) and value.startswith("="):
+                            col_letter = openpyxl.utils.get_column_letter(col_idx)
+                            if col_letter not in formulas:
+                                formulas[col_letter] = value
+                
+                template_info = {
+                    "headers": headers,
+                    "formulas": formulas,
+                    "sheet_name": ws.title,
+                    "max_row": ws.max_row,
+                    "max_col": ws.max_column
+                }
+            finally:
+                # Read-only workbooks keep the file open until closed
+                wb.close()
+            
+            self._template_cache[cache_key] = template_info
             logger.info(f"Template analysis complete. Headers: {len(headers)}")
             return template_info
             
@@ -214,6 +346,7 @@ class ExcelFormatter:
             # Create output DataFrame based on configuration
             output_data = {}
             output_columns = self.config["output_columns"]
+            row_count = len(input_df)
             
             # Apply mapping rules from configuration
             for col_config in output_columns:
@@ -227,16 +360,17 @@ class ExcelFormatter:
                     )
                 elif source_col == "":
                     # Blank field
-                    output_data[col_name] = [""] * len(input_df)
+                    output_data[col_name] = self._blank_column(row_count)
                 else:
-                    # Direct column mapping
+                    # Direct column mapping, referencing the input data without a copy
                     if source_col in input_df.columns:
-                        output_data[col_name] = input_df[source_col].values
+                        output_data[col_name] = input_df[source_col].to_numpy(copy=False)
                     else:
                         logger.warning(f"Column '{source_col}' not found in input data")
-                        output_data[col_name] = [""] * len(input_df)
+                        output_data[col_name] = self._blank_column(row_count)
             
-            result_df = pd.DataFrame(output_data)
+            # Wrap the column arrays as they are instead of copying them
+            result_df = pd.DataFrame(output_data, copy=False)
             
             # Apply void filtering if enabled
             result_df = self.apply_void_filtering(result_df)
@@ -248,6 +382,10 @@ class ExcelFormatter:
             logger.error(f"Error applying mapping: {str(e)}")
             raise
     
+    def _blank_column(self, row_count: int) -> np.ndarray:
+        """Create a column of empty strings as one array instead of a list."""
+        return np.full(row_count, "", dtype=object)
+    
     def apply_void_filtering(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Filter out rows where specified columns are all zero.
@@ -278,23 +416,20 @@ class ExcelFormatter:
             
             logger.info(f"Applying void filtering on columns: {existing_columns}")
             
+            # Convert to numeric, replacing non-numeric values with 0, as one 2-D block
+            zero_block = df[existing_columns].apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype=np.float64)
             # Create a mask for rows where all specified columns are zero or empty
-            mask = pd.Series([True] * len(df))
-            
-            for col in existing_columns:
-                # Convert to numeric, replacing non-numeric values with 0
-                numeric_col = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                # Check if column is zero
-                mask = mask & (numeric_col == 0)
+            mask = (zero_block == 0).all(axis=1)
             
             # Count rows to be removed
-            rows_to_remove = mask.sum()
+            rows_to_remove = int(mask.sum())
             total_rows = len(df)
             
             if rows_to_remove > 0:
                 logger.info(f"Removing {rows_to_remove} void rows out of {total_rows} total rows")
-                # Keep rows that are NOT all zero
-                filtered_df = df[~mask].copy()
+                # Keep rows that are NOT all zero; boolean indexing already returns
+                # a new frame, and the result is only read from here on
+                filtered_df = df[~mask]
                 logger.info(f"Filtered DataFrame shape: {filtered_df.shape}")
                 return filtered_df
             else:
@@ -319,32 +454,30 @@ class ExcelFormatter:
             List of calculated values
         """
         try:
-            result = []
             formula_clean = formula.replace("=", "").strip()
             
-            for idx, row in input_df.iterrows():
+            # Evaluate once over whole columns; anything the vectorized path
+            # doesn't support is evaluated row by row below
+            try:
+                return self._compile_formula(formula_clean)(input_df)
+            except Exception as e:
+                logger.info(f"Evaluating formula row by row: {e}")
+            
+            # Text substituted for each column reference, prepared once per column
+            value_text = {}
+            for formula_col, actual_col in FORMULA_COLUMN_MAPPING.items():
+                if actual_col in input_df.columns:
+                    value_text[formula_col] = self._formula_value_text(input_df[actual_col])
+                else:
+                    value_text[formula_col] = ["0"] * len(input_df)
+            
+            result = []
+            for position, idx in enumerate(input_df.index):
                 try:
-                    # Replace column references with actual values
-                    formula_eval = formula_clean
-                    
-                    # Map formula column names to actual data
-                    column_mapping = {
-                        "Chk Amt": "Net pay",
-                        "Gross": "Adjusted gross", 
-                        "Fica": "Employee taxes - SS + Employee taxes - Med"
-                    }
-                    
-                    for formula_col, actual_col in column_mapping.items():
-                        if actual_col in input_df.columns:
-                            value = row[actual_col]
-                            # Handle non-numeric values
-                            try:
-                                numeric_value = float(value) if pd.notna(value) else 0
-                                formula_eval = formula_eval.replace(formula_col, str(numeric_value))
-                            except (ValueError, TypeError):
-                                formula_eval = formula_eval.replace(formula_col, "0")
-                        else:
-                            formula_eval = formula_eval.replace(formula_col, "0")
+                    # Replace column references with actual values in one pass
+                    formula_eval = _FORMULA_NAME_RE.sub(
+                        lambda match: value_text[match.group(1)][position], formula_clean
+                    )
                     
                     # Evaluate the formula safely
                     if any(op in formula_eval for op in ["+", "-", "*", "/"]):
@@ -363,10 +496,94 @@ class ExcelFormatter:
             logger.error(f"Error evaluating formula {formula}: {str(e)}")
             return [0] * len(input_df)
     
+    def _compile_formula(self, formula_clean: str) -> Callable[[pd.DataFrame], List[Any]]:
+        """
+        Parse formula once into a function evaluated on whole columns.
+        
+        Args:
+            formula_clean: Formula string without the leading '='
+            
+        Returns:
+            Function taking the input DataFrame and returning calculated values
+            
+        Raises:
+            SyntaxError: If the formula can't be parsed
+            ValueError: If the formula uses anything beyond basic arithmetic
+        """
+        # Replace formula column names with placeholder identifiers
+        placeholders = {}
+        symbols = {}
+        for formula_col in _FORMULA_NAME_RE.findall(formula_clean):
+            if formula_col not in placeholders:
+                placeholders[formula_col] = f"_c{len(symbols)}"
+                symbols[placeholders[formula_col]] = FORMULA_COLUMN_MAPPING[formula_col]
+        expression = _FORMULA_NAME_RE.sub(lambda match: placeholders[match.group(1)], formula_clean)
+        
+        # Formulas without arithmetic keep their row-by-row behaviour
+        if not any(op in expression for op in ["+", "-", "*", "/"]):
+            raise ValueError("no arithmetic operator")
+        
+        tree = ast.parse(expression, mode='eval')
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load)) or type(node) in _FORMULA_OPERATORS:
+                continue
+            if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+                continue
+            if isinstance(node, ast.Name) and node.id in symbols:
+                continue
+            raise ValueError(f"unsupported syntax: {type(node).__name__}")
+        
+        def evaluate(node, columns):
+            if isinstance(node, ast.BinOp):
+                return _FORMULA_OPERATORS[type(node.op)](evaluate(node.left, columns), evaluate(node.right, columns))
+            if isinstance(node, ast.UnaryOp):
+                return _FORMULA_OPERATORS[type(node.op)](evaluate(node.operand, columns))
+            if isinstance(node, ast.Name):
+                return columns[node.id]
+            return node.value
+        
+        def run(input_df: pd.DataFrame) -> List[Any]:
+            columns = {
+                symbol: self._to_numeric(input_df[actual_col]) if actual_col in input_df.columns else 0
+                for symbol, actual_col in symbols.items()
+            }
+            
+            with np.errstate(all='ignore'):
+                values = np.asarray(evaluate(tree.body, columns))
+            values = np.broadcast_to(values, (len(input_df),))
+            
+            # Division by zero and similar errors evaluate to 0, as row by row
+            if values.dtype.kind == 'f':
+                values = np.where(np.isfinite(values), values, 0.0)
+            
+            return values.tolist()
+        
+        return run
+    
+    def _formula_value_text(self, values: pd.Series) -> List[str]:
+        """Format column values for substitution into a formula, with 0 for missing or non-numeric values."""
+        value_text = []
+        for value in values.tolist():
+            # Handle non-numeric values
+            try:
+                value_text.append(str(float(value) if pd.notna(value) else 0))
+            except (ValueError, TypeError):
+                value_text.append("0")
+        return value_text
+    
+    def _to_numeric(self, values: pd.Series) -> np.ndarray:
+        """Convert a column to floats, treating blanks, text and dates as 0."""
+        if values.dtype.kind in 'mM':
+            return np.zeros(len(values))
+        return pd.to_numeric(values, errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    
     def save_output(self, df: pd.DataFrame, output_path: Path) -> None:
         """
         Save DataFrame to Excel file with formatting.
         
+        The workbook is written once in write-only mode, with formatting
+        applied to each cell as its row is appended.
+        
         Args:
             df: DataFrame to save
             output_path: Output file path
@@ -374,11 +591,19 @@ class ExcelFormatter:
         try:
             logger.info(f"Saving output to: {output_path}")
             
-            # Save to Excel first
-            df.to_excel(output_path, index=False, engine='openpyxl')
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet("Sheet1")
+            
+            # Prepare styles and sheet settings before any rows are written
+            header_cells = self.format_headers(ws, df)
+            column_formats = self.format_columns(ws, df)
+            self.apply_general_settings(ws, df)
             
-            # Apply formatting
-            self.apply_formatting(output_path, df)
+            ws.append(header_cells)
+            self._write_data_rows(ws, df, column_formats)
+            
+            wb.save(output_path)
+            logger.info("Formatting applied successfully")
             
             logger.info(f"Output saved successfully: {output_path.name}")
             
@@ -386,79 +611,143 @@ class ExcelFormatter:
             logger.error(f"Error saving output file {output_path}: {str(e)}")
             raise
     
-    def apply_formatting(self, output_path: Path, df: pd.DataFrame) -> None:
+    def _write_data_rows(self, ws, df: pd.DataFrame, column_formats: List[Dict[str, Any]]) -> None:
         """
-        Apply formatting to the Excel file based on configuration.
+        Append data rows with column formatting applied.
         
         Args:
-            output_path: Path to the Excel file
-            df: DataFrame that was saved
+            ws: Write-only worksheet
+            df: DataFrame to write
+            column_formats: Formatting for each configured column
         """
-        try:
-            wb = load_workbook(output_path)
-            ws = wb.active
-            
-            # Apply header formatting
-            self.format_headers(ws, df)
-            
-            # Apply column formatting
-            self.format_columns(ws, df)
-            
-            # Apply general settings
-            self.apply_general_settings(ws)
-            
-            wb.save(output_path)
-            logger.info("Formatting applied successfully")
+        # Missing values are written as empty cells
+        values = df.to_numpy(dtype=object, copy=True)
+        values[pd.isna(values)] = None
+        
+        number_formats = self._number_formats(df, column_formats)
+        alignments = [column_format["alignment"] for column_format in column_formats]
+        
+        for row, row_formats in zip(values, number_formats):
+            cells = []
+            for col_pos, (value, number_format) in enumerate(zip(row.tolist(), row_formats.tolist())):
+                styled = col_pos < len(alignments)
+                if not styled and number_format is None:
+                    cells.append(value)
+                    continue
+                
+                cell = openpyxl.cell.WriteOnlyCell(ws, value=value)
+                if styled:
+                    cell.alignment = alignments[col_pos]
+                if number_format is not None:
+                    cell.number_format = number_format
+                cells.append(cell)
+            
+            ws.append(cells)
+    
+    def _number_formats(self, df: pd.DataFrame, column_formats: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Work out the number format of every data cell, one column at a time.
+        
+        Args:
+            df: DataFrame to write
+            column_formats: Formatting for each configured column
             
-        except Exception as e:
-            logger.error(f"Error applying formatting: {str(e)}")
-            raise
+        Returns:
+            Array shaped like df holding each cell's number format, or None
+        """
+        number_formats = np.full(df.shape, None, dtype=object)
+        
+        for col_pos in range(df.shape[1]):
+            column = df.iloc[:, col_pos]
+            target = number_formats[:, col_pos]
+            
+            # Match pandas' default date formats
+            if column.dtype.kind == 'M':
+                target[column.notna().to_numpy()] = "YYYY-MM-DD HH:MM:SS"
+            elif column.dtype == object:
+                for row_pos, value in enumerate(column.tolist()):
+                    if isinstance(value, datetime):
+                        target[row_pos] = "YYYY-MM-DD HH:MM:SS"
+                    elif isinstance(value, date):
+                        target[row_pos] = "YYYY-MM-DD"
+            
+            if col_pos >= len(column_formats):
+                continue
+            column_format = column_formats[col_pos]
+            
+            # Apply number formatting
+            if column_format["number_format"] is not None:
+                target[:] = column_format["number_format"]
+            
+            # Apply negative number formatting
+            if column_format["negative_format"] is not None:
+                target[self._negative_mask(column)] = column_format["negative_format"]
+            
+            # Apply date formatting
+            if column_format["date_format"] is not None:
+                target[:] = column_format["date_format"]
+        
+        return number_formats
+    
+    def _negative_mask(self, column: pd.Series) -> np.ndarray:
+        """Flag the numeric values below zero in a column."""
+        if column.dtype.kind in 'iuf':
+            return (column < 0).fillna(False).to_numpy(dtype=bool)
+        if column.dtype == object:
+            return np.array([
+                isinstance(value, (int, float, np.number)) and not isinstance(value, bool) and value < 0
+                for value in column.tolist()
+            ], dtype=bool)
+        return np.zeros(len(column), dtype=bool)
     
-    def format_headers(self, ws, df: pd.DataFrame) -> None:
-        """Format the header row."""
+    def format_headers(self, ws, df: pd.DataFrame) -> List[Any]:
+        """Build the formatted header row."""
+        header_cells = list(df.columns)
         try:
             header_config = self.config.get("header_formatting", {})
             column_name_alignment = self.config.get("column_name_alignment", {})
             
             # Header row styling
-            header_font = Font(
+            header_font = openpyxl.styles.Font(
                 bold=header_config.get("bold", True),
                 color=header_config.get("font_color", "FFFFFF")
             )
             
-            header_fill = PatternFill(
+            header_fill = openpyxl.styles.PatternFill(
                 start_color=header_config.get("background_color", "366092"),
                 end_color=header_config.get("background_color", "366092"),
                 fill_type="solid"
             )
             
             # Default header alignment
-            default_header_alignment = Alignment(
+            default_header_alignment = openpyxl.styles.Alignment(
                 horizontal=header_config.get("alignment", "center"),
                 vertical="center"
             )
             
             # Apply to header row
-            for col_num in range(1, len(df.columns) + 1):
-                cell = ws.cell(row=1, column=col_num)
+            for col_num, col_name in enumerate(df.columns):
+                cell = openpyxl.cell.WriteOnlyCell(ws, value=col_name)
                 cell.font = header_font
                 cell.fill = header_fill
                 
                 # Use specific column alignment if defined, otherwise use default
-                col_name = df.columns[col_num - 1]
                 if col_name in column_name_alignment:
-                    cell.alignment = Alignment(
+                    cell.alignment = openpyxl.styles.Alignment(
                         horizontal=column_name_alignment[col_name],
                         vertical="center"
                     )
                 else:
                     cell.alignment = default_header_alignment
+                header_cells[col_num] = cell
                 
         except Exception as e:
             logger.warning(f"Error formatting headers: {str(e)}")
+        return header_cells
     
-    def format_columns(self, ws, df: pd.DataFrame) -> None:
-        """Format data columns based on configuration."""
+    def format_columns(self, ws, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Set column widths and build data formatting for each configured column."""
+        column_formats = []
         try:
             output_columns = self.config["output_columns"]
             
@@ -468,57 +757,36 @@ class ExcelFormatter:
                 
                 # Set column width
                 if "width" in col_config:
-                    ws.column_dimensions[get_column_letter(col_idx)].width = col_config["width"]
+                    ws.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = col_config["width"]
                 
-                # Set alignment
-                alignment = Alignment(
-                    horizontal=col_config.get("alignment", "left"),
-                    vertical="center"
-                )
-                
-                # Apply formatting to all data rows
-                for row_num in range(2, len(df) + 2):  # Start from row 2 (after header)
-                    cell = ws.cell(row=row_num, column=col_idx)
-                    cell.alignment = alignment
-                    
-                    # Apply number formatting
-                    if "number_format" in formatting:
-                        cell.number_format = formatting["number_format"]
-                    
-                    # Apply negative number formatting
-                    if "negative_format" in formatting and isinstance(cell.value, (int, float)) and cell.value < 0:
-                        cell.number_format = formatting["negative_format"]
-                    
-                    # Apply date formatting
-                    if "date_format" in formatting and col_name in ["Date"]:
-                        cell.number_format = "mm/dd/yyyy"
-                    
-                    # Apply date range formatting for Period column
-                    if "date_range_format" in formatting and col_name in ["Period"]:
-                        # This would need special handling for date ranges
-                        pass
+                column_formats.append({
+                    # Set alignment
+                    "alignment": openpyxl.styles.Alignment(
+                        horizontal=col_config.get("alignment", "left"),
+                        vertical="center"
+                    ),
+                    "number_format": formatting.get("number_format"),
+                    "negative_format": formatting.get("negative_format"),
+                    # Date formatting for the Date column; date ranges in Period
+                    # would need special handling
+                    "date_format": "mm/dd/yyyy" if "date_format" in formatting and col_name in ["Date"] else None
+                })
                         
         except Exception as e:
             logger.warning(f"Error formatting columns: {str(e)}")
+        return column_formats
     
-    def apply_general_settings(self, ws) -> None:
+    def apply_general_settings(self, ws, df: pd.DataFrame) -> None:
         """Apply general worksheet settings."""
         try:
             general_settings = self.config.get("general_settings", {})
             
             # Auto-fit columns
             if general_settings.get("auto_fit_columns", True):
-                for column in ws.columns:
-                    max_length = 0
-                    column_letter = get_column_letter(column[0].column)
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
+                for col_idx, col_name in enumerate(df.columns, 1):
+                    max_length = max(len(str(col_name)), self._content_width(df.iloc[:, col_idx - 1]))
                     adjusted_width = min(max_length + 2, 50)  # Cap at 50
-                    ws.column_dimensions[column_letter].width = adjusted_width
+                    ws.column_dimensions[openpyxl.utils.get_column_letter(col_idx)].width = adjusted_width
             
             # Freeze panes
             if "freeze_panes" in general_settings:
@@ -527,13 +795,42 @@ class ExcelFormatter:
         except Exception as e:
             logger.warning(f"Error applying general settings: {str(e)}")
     
-    def process_single_file(self, input_file: Path, template_file: Path) -> Path:
+    def _content_width(self, column: pd.Series) -> int:
+        """
+        Measure the longest text value in a column.
+        
+        Args:
+            column: Column values to measure
+            
+        Returns:
+            Length of the longest value as written to the sheet, 0 for an empty column
+        """
+        if column.empty:
+            return 0
+        
+        # Integers and text are measured in C; other types need their written form
+        if column.dtype.kind in 'biu':
+            lengths = column.astype(str).str.len()
+        elif column.dtype.kind == 'f':
+            lengths = column.map(_FLOAT_TEXT).str.len()
+        elif pd.api.types.is_string_dtype(column.dtype) and column.dtype != object:
+            lengths = column.str.len()
+        else:
+            lengths = column.map(_cell_text).str.len()
+        
+        # Missing values are measured like the empty cells they become
+        lengths = np.where(column.isna().to_numpy(), len(str(None)), lengths.to_numpy(dtype=float, na_value=0))
+        return int(lengths.max())
+    
+    def process_single_file(self, input_file: Path, template_file: Path,
+                            template_info: Optional[Dict[str, Any]] = None) -> Path:
         """
         Process a single input file with a template.
         
         Args:
             input_file: Path to input file
             template_file: Path to template file
+            template_info: Already analyzed template structure, if available
             
         Returns:
             Path to the generated output file
@@ -541,6 +838,12 @@ class ExcelFormatter:
         try:
             logger.info(f"Processing file: {input_file.name}")
             
+            # Generate output filename with .xlsx extension and timestamp,
+            # stamped with the time processing started
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_filename = f"{input_file.stem}_formatted_{timestamp}.xlsx"
+            output_path = self.output_dir / output_filename
+            
             # Read input data
             input_df = self.read_excel_file(input_file)
             
@@ -549,17 +852,13 @@ class ExcelFormatter:
             logger.info(f"Total columns: {len(input_df.columns)}")
             logger.info(f"First few rows of data:\n{input_df.head()}")
             
-            # Analyze template
-            template_info = self.analyze_template(template_file)
+            # Analyze template unless the caller already did
+            if template_info is None:
+                template_info = self.analyze_template(template_file)
             
             # Apply mapping
             output_df = self.apply_mapping(input_df, template_info)
             
-            # Generate output filename with .xlsx extension and timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"{input_file.stem}_formatted_{timestamp}.xlsx"
-            output_path = self.output_dir / output_filename
-            
             # Save output
             self.save_output(output_df, output_path)
             
@@ -570,10 +869,17 @@ class ExcelFormatter:
             logger.error(f"Error processing file {input_file.name}: {str(e)}")
             raise
     
-    def process_all_files(self) -> List[Path]:
+    def process_all_files(self, max_workers: Optional[int] = None) -> List[Path]:
         """
         Process all input files with available templates.
         
+        Batches of at least PARALLEL_MIN_BYTES are processed in parallel
+        worker processes; files that fail are logged and skipped so the
+        rest of the batch still completes.
+        
+        Args:
+            max_workers: Maximum worker processes (defaults to CPU count)
+            
         Returns:
             List of generated output file paths
         """
@@ -596,15 +902,42 @@ class ExcelFormatter:
             template_file = template_files[0]
             logger.info(f"Using template: {template_file.name}")
             
+            # The same template serves every input file, so analyze it once
+            template_info = self.analyze_template(template_file)
+            
             output_files = []
             
-            for input_file in input_files:
-                try:
-                    output_path = self.process_single_file(input_file, template_file)
-                    output_files.append(output_path)
-                except Exception as e:
-                    logger.error(f"Failed to process {input_file.name}: {str(e)}")
-                    continue
+            # Starting worker processes isn't worth it for a small batch
+            workers = min(len(input_files), max_workers or os.cpu_count() or 1)
+            batch_bytes = sum(input_file.stat().st_size for input_file in input_files)
+            if workers <= 1 or batch_bytes < PARALLEL_MIN_BYTES:
+                for input_file in input_files:
+                    try:
+                        output_path = self.process_single_file(input_file, template_file, template_info)
+                        output_files.append(output_path)
+                    except Exception as e:
+                        logger.error(f"Failed to process {input_file.name}: {str(e)}")
+                        continue
+            else:
+                results = {}
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(self.config, self.input_dir, self.template_dir, self.output_dir)
+                ) as executor:
+                    futures = {
+                        executor.submit(_process_one, input_file, template_file, template_info): input_file
+                        for input_file in input_files
+                    }
+                    for future in as_completed(futures):
+                        input_file = futures[future]
+                        try:
+                            results[input_file] = future.result()
+                        except Exception as e:
+                            logger.error(f"Failed to process {input_file.name}: {str(e)}")
+                
+                # Keep the input order regardless of completion order
+                output_files = [results[input_file] for input_file in input_files if input_file in results]
             
             logger.info(f"Batch processing complete. Generated {len(output_files)} output files")
             return output_files
@@ -614,6 +947,25 @@ class ExcelFormatter:
             raise
 
 
+# Formatter shared by every file a worker process handles
+_worker_formatter: Optional[ExcelFormatter] = None
+
+
+def _init_worker(config: Dict[str, Any], input_dir: Path, template_dir: Path, output_dir: Path) -> None:
+    """Build a worker process's formatter from the parent's configuration."""
+    global _worker_formatter
+    _worker_formatter = ExcelFormatter(str(input_dir), str(template_dir), str(output_dir), config=config)
+
+
+def _process_one(input_file: Path, template_file: Path, template_info: Dict[str, Any]) -> Path:
+    """
+    Process a single file in a worker process.
+    
+    Defined at module level so it can be pickled by ProcessPoolExecutor.
+    """
+    return _worker_formatter.process_single_file(input_file, template_file, template_info)
+
+
 def main():
     """Main function to run the Excel formatter."""
     try:
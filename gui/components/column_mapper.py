@@ -8,15 +8,229 @@ to output columns with various transformation options.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+import tkinter.font as tkfont
 from typing import Dict, List, Any, Optional, Callable
-import json
+import functools
+import itertools
+import logging
+import re
 
 from config.settings import *
 
+# Alignment choices and initial values shared by every mapping row
+_ALIGN_VALUES = tuple(COLUMN_ALIGNMENTS)
+_DEFAULT_ALIGN = "left"
+_DEFAULT_WIDTH = "15"
+_DEFAULT_FORMAT = "General"
+
+# Format preview samples in priority order; a rule applies when the format
+# code contains all of its tokens
+_PREVIEW_RULES = (
+    (("0.00",), "1,234.56"),
+    (("0.0",), "1,234.5"),
+    (("0", "#"), "1,234"),
+    (("%",), "12.34%"),
+    (("$",), "$1,234.56"),
+    (("mm",), "12/25/2023"),
+    (("dd",), "12/25/2023"),
+)
+_DEFAULT_PREVIEW = "1234.5678"
+
+
+@functools.lru_cache(maxsize=256)
+def _preview_for(format_code: str) -> str:
+    """
+    Get the preview sample for a format code.
+    
+    Typing revisits the same prefixes, so results are cached per code.
+    
+    Args:
+        format_code: Excel number format code
+        
+    Returns:
+        Sample value formatted roughly as the code would show it
+    """
+    for tokens, preview in _PREVIEW_RULES:
+        if all(token in format_code for token in tokens):
+            return preview
+    return _DEFAULT_PREVIEW
+
+
+def _scroll_canvas(canvas: tk.Canvas, event):
+    """
+    Scroll a canvas by mousewheel notches.
+    
+    Args:
+        canvas: Canvas to scroll
+        event: MouseWheel event; one notch is a delta of 120
+    """
+    notches = abs(event.delta) // 120
+    canvas.yview_scroll(-notches if event.delta > 0 else notches, "units")
+
+
+# Tokens of a formula: a quoted column name, an operator, or a plain column
+# name or number. "-" only counts as an operator with spaces around it, as
+# the visual builder writes it, so hyphenated names stay whole.
+_FORMULA_TOKEN_RE = re.compile(
+    r'"([^"]*)"'
+    r'|([+*/]|(?<=\s)-(?=\s))'
+    r'|([^"+*/\s](?:[^"+*/\s]|\s(?!-\s))*)'
+)
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+# Predefined number formats of the format dialog as (label, format code)
+_GENERAL_FORMATS = (
+    ("General", "General"),
+    ("Number", "#,##0"),
+    ("Number (2 decimals)", "#,##0.00"),
+    ("Currency", '"$"#,##0.00'),
+    ("Percentage", "0%"),
+    ("Percentage (2 decimals)", "0.00%"),
+    ("Date", "mm/dd/yyyy"),
+    ("Time", "h:mm AM/PM"),
+    ("Text", "@"),
+)
+
+_NUMBER_FORMATS = (
+    ("0", "0"),
+    ("0.0", "0.0"),
+    ("0.00", "0.00"),
+    ("#,##0", "#,##0"),
+    ("#,##0.0", "#,##0.0"),
+    ("#,##0.00", "#,##0.00"),
+    ("0.0%", "0.0%"),
+    ("0.00%", "0.00%"),
+    ("0.000%", "0.000%"),
+)
+
+_CURRENCY_FORMATS = (
+    ('$0', '"$"0'),
+    ('$0.00', '"$"0.00'),
+    ('$#,##0', '"$"#,##0'),
+    ('$#,##0.00', '"$"#,##0.00'),
+    ('$#,##0.00_);($#,##0.00)', '"$"#,##0.00_);("$"#,##0.00)'),
+    ('$0.00_);($0.00)', '"$"0.00_);("$"0.00)'),
+    ('(#,##0.00)', '(#,##0.00) - Accounting Format'),
+    ('-(#,##0.00)', '-(#,##0.00) - Negative Outside Parentheses'),
+    ('(#,##0)', '(#,##0) - Accounting Format (no decimals)'),
+)
+
+_DATE_FORMATS = (
+    ("mm/dd/yyyy", "mm/dd/yyyy"),
+    ("m/d/yy", "m/d/yy"),
+    ("mm-dd-yyyy", "mm-dd-yyyy"),
+    ("d-mmm-yy", "d-mmm-yy"),
+    ("d-mmm", "d-mmm"),
+    ("mmm-yy", "mmm-yy"),
+    ("h:mm AM/PM", "h:mm AM/PM"),
+    ("h:mm:ss AM/PM", "h:mm:ss AM/PM"),
+    ("h:mm", "h:mm"),
+    ("h:mm:ss", "h:mm:ss"),
+)
+
+_FORMAT_CATEGORIES = (
+    ("General", _GENERAL_FORMATS),
+    ("Number", _NUMBER_FORMATS),
+    ("Currency", _CURRENCY_FORMATS),
+    ("Date", _DATE_FORMATS),
+)
+
+_CUSTOM_INSTRUCTIONS_TEXT = (
+    "Enter a custom Excel format code:\n\n"
+    "Examples:\n"
+    "• #,##0.00 - Number with thousands separator and 2 decimals\n"
+    "• \"$\"#,##0.00 - Currency with dollar sign\n"
+    "• 0.00% - Percentage with 2 decimals\n"
+    "• mm/dd/yyyy - Date format\n"
+    "• @ - Text format\n\n"
+    "For more help, see Excel's Format Cells dialog."
+)
+
+
+# Static text of the Column Mapping Examples window
+MAPPING_EXAMPLES_TEXT = """COLUMN MAPPING EXAMPLES
+
+1. DIRECT MAPPING
+   Input Column: Name
+   → Maps the "Name" column directly to output
+   
+2. EMPTY/BLANK COLUMNS  
+   Input Column: (leave blank or empty)
+   → Creates empty column in output
+   
+3. FORMULAS (using output column names)
+   Input Column: =Chk Amt - Gross - Fica
+   → Calculates: Check Amount minus Gross minus FICA
+   
+   Input Column: =Gross * 0.15
+   → Calculates: Gross times 0.15 (15%)
+   
+
+5. PRACTICAL EXAMPLES:
+
+   For Payroll Processing:
+   • Employee Name → Name (direct mapping)
+   • Check # → (blank for manual entry)  
+   • Net Pay → Chk Amt (direct mapping)
+   • Adjusted Gross → Gross (direct mapping)
+   • Employee taxes - SS + Employee taxes - Med → Fica E/R
+   • =Chk Amt - Gross - Fica → Liab (calculated liability)
+   • Pay Date → Date (direct mapping)
+   • Time Period → Period (direct mapping)
+
+TIPS:
+• For formulas (=), use OUTPUT column names as they appear in your mapping
+• Leave input blank to create empty columns for manual data entry
+• Use the "..." button for advanced formatting (colors, number formats, etc.)
+• Preview your output before processing to verify mappings"""
+
+
+class MappingRow:
+    """State of one mapping row; widgets are attached only while it is in view."""
+    
+    __slots__ = ('row_id', 'slot', 'widgets', 'input_var', 'expression_parts',
+                 'output_var', 'align_var', 'width_var', 'format_var',
+                 'advanced_settings', 'config', 'config_dirty')
+    
+    def __init__(self, row_id: int, slot: int, output_name: str):
+        """
+        Initialize the state of a mapping row.
+        
+        Args:
+            row_id: Stable id of the row
+            slot: Grid row, swapped when rows are reordered
+            output_name: Initial output column name
+        """
+        self.row_id = row_id
+        self.slot = slot
+        self.widgets = {}  # Widget name -> widget, empty while out of view
+        self.input_var = tk.StringVar()
+        self.expression_parts = []  # Store the structured expression
+        self.output_var = tk.StringVar(value=output_name)
+        self.align_var = tk.StringVar(value=_DEFAULT_ALIGN)
+        self.width_var = tk.StringVar(value=_DEFAULT_WIDTH)
+        self.format_var = tk.StringVar(value=_DEFAULT_FORMAT)
+        self.advanced_settings = {}  # Advanced settings (initially empty)
+        self.config = None  # Cached output column config
+        self.config_dirty = True
+
 
 class ColumnMapper(ttk.Frame):
     """Component for mapping input columns to output columns."""
     
+    # Row widgets gridded directly into scrollable_frame
+    _ROW_GRIDDED = ('row_label', 'input_frame', 'arrow_label', 'output_entry',
+                    'align_combo', 'width_entry', 'format_entry', 'action_frame')
+    # Row widgets showing one of the row's StringVars
+    _ROW_VARIABLES = (('input_display', 'input_var'), ('output_entry', 'output_var'),
+                      ('align_combo', 'align_var'), ('width_entry', 'width_var'),
+                      ('format_entry', 'format_var'))
+    # Interactive row widgets and the action each one dispatches
+    _ROW_ROLES = {'build_btn': 'build', 'output_entry': 'output', 'align_combo': 'align',
+                  'width_entry': 'width', 'format_entry': 'format', 'up_btn': 'up',
+                  'down_btn': 'down', 'advanced_btn': 'advanced', 'delete_btn': 'delete'}
+    
     def __init__(self, parent, on_mapping_changed: Optional[Callable[[Dict[str, Any]], None]] = None):
         """
         Initialize the column mapper component.
@@ -29,12 +243,60 @@ class ColumnMapper(ttk.Frame):
         
         self.on_mapping_changed = on_mapping_changed
         self.input_columns = []
-        self.mapping_rows = []
+        self.mapping_rows = {}  # Row id -> row data
+        self._row_order = []  # Row ids in display order
+        self._slot_rows = {}  # Grid row -> row id
+        self._row_ids = itertools.count()
         self.format_dialog_open = False  # Track if format dialog is open
+        self._row_height = 0  # Estimated up front, then measured from the first row built
+        self._row_measured = False
+        # Size of scrollable_frame for the scroll region; set only from its <Configure>
+        self._content_width = 0
+        self._content_height = 0
+        self._built_rows = set()  # Ids of rows that currently have widgets
+        self._row_pool = []  # Hidden row widget sets ready for reuse
+        self._bulk = False  # Set while many rows are added or removed at once
+        self._pending_after = None  # Debounced change notification
+        self._vis_pending = False  # Scrollbar visibility check queued for idle
+        self._examples_window = None  # Reused across show_examples calls
+        self._config_cache = None  # Output column list, rebuilt when stale
+        
+        # Row widgets share one Tcl command and one bind tag instead of
+        # registering a closure per widget
+        self._widget_rows = {}  # Widget path -> (row_data, role)
+        self._row_tag = f"MappingRow{id(self)}"
+        self._row_command = self.register(self._on_row_command)
+        self._width_validator = self.register(self._is_width_text)
+        # Everything inside the canvas scrolls it through one wheel binding
+        self._scroll_tag = f"MappingScroll{id(self)}"
+        # Class bindings are not cleaned up with the widget, so destroy()
+        # removes them by their command names
+        self._class_bindings = [
+            (tag, sequence, self.bind_class(tag, sequence, handler))
+            for tag, sequence, handler in (
+                (self._row_tag, "<KeyRelease>", self._on_row_key),
+                (self._row_tag, "<<ComboboxSelected>>", self._on_row_selected),
+                (self._row_tag, "<Button-1>", self._on_row_click),
+                (self._scroll_tag, "<MouseWheel>", self._on_mousewheel))
+        ]
         
         self.create_widgets()
         self.add_initial_row()
         
+    def destroy(self):
+        """Release class bindings and pending callbacks, then destroy."""
+        if self._pending_after is not None:
+            self.after_cancel(self._pending_after)
+            self._pending_after = None
+        for tag, sequence, funcid in self._class_bindings:
+            self.unbind_class(tag, sequence)
+            self.deletecommand(funcid)
+        self._class_bindings = []
+        self._widget_rows.clear()
+        self._row_pool.clear()
+        self.mapping_rows.clear()
+        super().destroy()
+        
     def create_widgets(self):
         """Create and arrange the column mapper widgets."""
         # Configure grid
@@ -124,13 +386,11 @@ class ColumnMapper(ttk.Frame):
         self.scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=self.canvas.yview)
         self.scrollable_frame = ttk.Frame(self.canvas)
         
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self._on_frame_configure()
-        )
+        self.scrollable_frame.bind("<Configure>", self._on_frame_configure)
         
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        # Every view change goes through here so rows scrolled into view get built
+        self.canvas.configure(yscrollcommand=self._on_canvas_scrolled)
         
         self.canvas.grid(row=0, column=0, sticky="nsew")
         # Don't grid the scrollbar initially - it will be shown when needed
@@ -138,13 +398,9 @@ class ColumnMapper(ttk.Frame):
         # Bind canvas resize to update scrollbar visibility
         self.canvas.bind("<Configure>", lambda e: self._on_canvas_configure())
         
-        # Bind mousewheel to canvas and frame
-        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
-        self.scrollable_frame.bind("<MouseWheel>", self._on_mousewheel)
-        
-        # Bind mouse enter/leave for scrolling focus
-        self.canvas.bind("<Enter>", self._bind_mousewheel)
-        self.canvas.bind("<Leave>", self._unbind_mousewheel)
+        # Scroll with the mousewheel over the canvas and everything in it
+        self._add_scroll_tag(self.canvas)
+        self._add_scroll_tag(self.scrollable_frame)
         
         # Configure scrollable frame grid
         self.scrollable_frame.grid_columnconfigure(1, weight=1)  # Source column dropdown
@@ -153,6 +409,26 @@ class ColumnMapper(ttk.Frame):
         # Create header row
         self.create_header_row()
         
+        # Rows reserve space before any of them is built
+        self._row_height = self._estimate_row_height()
+        
+    def _estimate_row_height(self) -> int:
+        """
+        Estimate the height of a mapping row before one has been built.
+        
+        Returns:
+            Height of the tallest probe widget plus the row padding
+        """
+        tallest = 0
+        for widget_class in (ttk.Button, ttk.Combobox):
+            probe = widget_class(self.scrollable_frame)
+            tallest = max(tallest, probe.winfo_reqheight())
+            probe.destroy()
+        if tallest <= 1:
+            # No geometry yet; fall back to the font's line height
+            tallest = tkfont.nametofont("TkDefaultFont").metrics("linespace") + 10
+        return tallest + 4  # pady=2 above and below
+        
     def create_header_row(self):
         """Create the header row for the mapping table."""
         headers = ["#", "Input Column", "→", "Output Column", "Align", "Width", "Format", "Actions"]
@@ -169,39 +445,102 @@ class ColumnMapper(ttk.Frame):
                 label.grid(row=0, column=col, sticky="ew", padx=5, pady=5)
             else:
                 label.grid(row=0, column=col, padx=5, pady=5)
+            self._add_scroll_tag(label)
                 
         # Separator line
         separator = ttk.Separator(self.scrollable_frame, orient="horizontal")
         separator.grid(row=1, column=0, columnspan=7, sticky="ew", pady=5)
+        self._add_scroll_tag(separator)
         
     def _on_mousewheel(self, event):
         """Handle mouse wheel scrolling."""
-        self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-        
-    def _bind_mousewheel(self, event):
-        """Bind mousewheel when mouse enters the canvas."""
-        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
+        _scroll_canvas(self.canvas, event)
         
-    def _unbind_mousewheel(self, event):
-        """Unbind mousewheel when mouse leaves the canvas."""
-        self.canvas.unbind_all("<MouseWheel>")
+    def _add_scroll_tag(self, widget):
+        """Let the mousewheel scroll the canvas while over a widget."""
+        widget.bindtags(widget.bindtags() + (self._scroll_tag,))
         
-    def _on_frame_configure(self):
+    def _on_frame_configure(self, event):
         """Handle frame resize and auto-hide/show scrollbar."""
-        # Update scroll region
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        self._update_scrollbar_visibility()
+        # The event carries the frame's size, so no bbox("all") is needed
+        self._content_width = event.width
+        self._content_height = event.height
+        self.update_canvas_scroll()
+        self._schedule_scrollbar_visibility()
         
     def _on_canvas_configure(self):
         """Handle canvas resize and update scrollbar visibility."""
-        self._update_scrollbar_visibility()
+        self._schedule_scrollbar_visibility()
+        self._update_visible_rows()
+        
+    def _on_canvas_scrolled(self, first, last):
+        """Move the scrollbar and build the rows that came into view."""
+        self.scrollbar.set(first, last)
+        self._update_visible_rows()
+        
+    def _update_visible_rows(self):
+        """
+        Build widgets for rows in the viewport and drop them everywhere else.
         
+        Off-screen rows keep only their StringVar state; their grid rows stay
+        open through a minsize so the scroll region still covers them.
+        """
+        visible = set()
+        if self._row_order:
+            top = self.canvas.canvasy(0)
+            bottom = top + max(self.canvas.winfo_height(), 1)
+            first_slot = self.scrollable_frame.grid_location(0, top)[1] - MAPPING_ROW_BUFFER
+            last_slot = self.scrollable_frame.grid_location(0, bottom)[1] + MAPPING_ROW_BUFFER
+            for slot in range(first_slot, last_slot + 1):
+                row_id = self._slot_rows.get(slot)
+                if row_id is not None:
+                    visible.add(row_id)
+                    
+        for row_id in self._built_rows - visible:
+            self._dematerialize_row(row_id)
+        for row_id in visible - self._built_rows:
+            self._materialize_row(row_id)
+        self._built_rows = visible
+        
+    def _dematerialize_row(self, row_id: int):
+        """Hide the widgets of a row and pool them, keeping its StringVar state."""
+        if row_id in self.mapping_rows:
+            row_data = self.mapping_rows[row_id]
+            widgets = row_data.widgets
+            if widgets:
+                for name in self._ROW_ROLES:
+                    self._widget_rows.pop(str(widgets[name]), None)
+                for name in self._ROW_GRIDDED:
+                    widgets[name].grid_remove()
+                self._row_pool.append(widgets)
+                row_data.widgets = {}
+            
+    def _clear_rows(self):
+        """Remove every mapping row and close its grid slot."""
+        for row_id in self._built_rows:
+            self._dematerialize_row(row_id)
+        self._built_rows = set()
+        for slot in self._slot_rows:
+            self.scrollable_frame.grid_rowconfigure(slot, minsize=0)
+        self.mapping_rows.clear()
+        self._row_order.clear()
+        self._slot_rows.clear()
+        self._row_ids = itertools.count()
+        self._config_cache = None
+        
+    def _schedule_scrollbar_visibility(self):
+        """Queue one scrollbar visibility check for the next idle tick."""
+        if not self._vis_pending:
+            self._vis_pending = True
+            self.after_idle(self._update_scrollbar_visibility)
+            
     def _update_scrollbar_visibility(self):
         """Update scrollbar visibility based on content size."""
+        self._vis_pending = False
         try:
             # Get dimensions
             canvas_height = self.canvas.winfo_height()
-            content_height = self.scrollable_frame.winfo_reqheight()
+            content_height = self._content_height
             
             # Only check if both dimensions are valid
             if canvas_height > 1 and content_height > 1:
@@ -219,25 +558,57 @@ class ColumnMapper(ttk.Frame):
         """Add the first mapping row."""
         self.add_mapping_row()
         
-    def add_mapping_row(self):
-        """Add a new column mapping row."""
-        row_index = len(self.mapping_rows)
-        row_num = row_index + 2  # +2 because of header and separator
+    def add_mapping_row(self) -> MappingRow:
+        """
+        Add a new column mapping row.
         
-        # Row data
-        row_data = {
-            'index': row_index,
-            'widgets': {}
-        }
+        Returns:
+            The new row
+        """
+        row_id = next(self._row_ids)
+        slot = row_id + 2  # +2 because of header and separator
+        
+        # Row state; the widgets are built by _materialize_row once it is in view
+        row_data = MappingRow(row_id, slot, f"Column {len(self._row_order) + 1}")
+        
+        # Any edit to the row's values invalidates its cached config
+        mark_dirty = lambda *args: self._mark_row_dirty(row_data)
+        for var in (row_data.input_var, row_data.output_var, row_data.align_var,
+                    row_data.width_var, row_data.format_var):
+            var.trace_add("write", mark_dirty)
+        
+        self.mapping_rows[row_id] = row_data
+        self._row_order.append(row_id)
+        self._slot_rows[slot] = row_id
+        self._config_cache = None
+        # Keep the grid row open so off-screen rows still take up scroll space
+        self.scrollable_frame.grid_rowconfigure(slot, minsize=self._row_height)
+        self.update_button_states()
+        if not self._bulk:
+            self._update_visible_rows()
+        
+        # Trigger callback
+        self._on_mapping_changed(row_id)
+        return row_data
+        
+    def _materialize_row(self, row_id: int):
+        """Build the widgets of a mapping row from its stored state."""
+        row_data = self.mapping_rows[row_id]
+        if row_data.widgets:
+            return
+        if self._row_pool:
+            self._reuse_row_widgets(row_data)
+            return
+        row_num = row_data.slot
         
         # Row number
         row_label = ttk.Label(
             self.scrollable_frame,
-            text=str(row_index + 1),
+            text=str(self._row_order.index(row_id) + 1),
             foreground=COLORS["text_secondary"]
         )
         row_label.grid(row=row_num, column=0, padx=5, pady=2)
-        row_data['widgets']['row_label'] = row_label
+        row_data.widgets['row_label'] = row_label
         
         # Input mapping frame - contains the mapping builder
         input_frame = ttk.Frame(self.scrollable_frame)
@@ -248,83 +619,75 @@ class ColumnMapper(ttk.Frame):
         build_btn = ttk.Button(
             input_frame,
             text="Build...",
-            command=lambda idx=row_index: self.show_expression_builder(idx),
             width=8
         )
         build_btn.grid(row=0, column=0, padx=(0, 5))
+        self._bind_row_widget(build_btn, row_data, 'build')
         
-        # Simple display for the current mapping (on the right)
-        input_var = tk.StringVar()
-        input_display = ttk.Entry(
+        # Simple display for the current mapping (on the right); a Label
+        # carries no cursor or selection state like a readonly Entry does
+        input_display = ttk.Label(
             input_frame,
-            textvariable=input_var,
-            state="readonly",
+            textvariable=row_data.input_var,
             width=25,
-            font=("Consolas", 9)
+            font=("Consolas", 9),
+            relief="sunken",
+            padding=(3, 1)
         )
         input_display.grid(row=0, column=1, sticky="ew")
         
-        row_data['widgets']['input_frame'] = input_frame
-        row_data['widgets']['input_display'] = input_display
-        row_data['widgets']['build_btn'] = build_btn
-        row_data['input_var'] = input_var
-        row_data['expression_parts'] = []  # Store the structured expression
+        row_data.widgets['input_frame'] = input_frame
+        row_data.widgets['input_display'] = input_display
+        row_data.widgets['build_btn'] = build_btn
         
         # Arrow
         arrow_label = ttk.Label(self.scrollable_frame, text="→")
         arrow_label.grid(row=row_num, column=2, padx=5, pady=2)
-        row_data['widgets']['arrow_label'] = arrow_label
+        row_data.widgets['arrow_label'] = arrow_label
         
         # Output column name
-        output_var = tk.StringVar(value=f"Column {row_index + 1}")
         output_entry = ttk.Entry(
             self.scrollable_frame,
-            textvariable=output_var,
+            textvariable=row_data.output_var,
             width=20
         )
         output_entry.grid(row=row_num, column=3, sticky="ew", padx=5, pady=2)
-        output_entry.bind("<KeyRelease>", lambda e, idx=row_index: self._on_mapping_changed(idx))
-        row_data['widgets']['output_entry'] = output_entry
-        row_data['output_var'] = output_var
+        self._bind_row_widget(output_entry, row_data, 'output')
+        row_data.widgets['output_entry'] = output_entry
         
         # Alignment dropdown
-        align_var = tk.StringVar(value="left")
         align_combo = ttk.Combobox(
             self.scrollable_frame,
-            textvariable=align_var,
-            values=COLUMN_ALIGNMENTS,
+            textvariable=row_data.align_var,
+            values=_ALIGN_VALUES,
             state="readonly",
             width=8
         )
         align_combo.grid(row=row_num, column=4, padx=5, pady=2)
-        align_combo.bind("<<ComboboxSelected>>", lambda e, idx=row_index: self._on_mapping_changed(idx))
-        row_data['widgets']['align_combo'] = align_combo
-        row_data['align_var'] = align_var
+        self._bind_row_widget(align_combo, row_data, 'align')
+        row_data.widgets['align_combo'] = align_combo
         
         # Width entry
-        width_var = tk.StringVar(value="15")
         width_entry = ttk.Entry(
             self.scrollable_frame,
-            textvariable=width_var,
-            width=6
+            textvariable=row_data.width_var,
+            width=6,
+            validate="key",
+            validatecommand=(self._width_validator, "%P")
         )
         width_entry.grid(row=row_num, column=5, padx=5, pady=2)
-        width_entry.bind("<KeyRelease>", lambda e, idx=row_index: self._on_mapping_changed(idx))
-        row_data['widgets']['width_entry'] = width_entry
-        row_data['width_var'] = width_var
+        self._bind_row_widget(width_entry, row_data, 'width')
+        row_data.widgets['width_entry'] = width_entry
         
         # Format entry
-        format_var = tk.StringVar(value="General")
         format_entry = ttk.Entry(
             self.scrollable_frame,
-            textvariable=format_var,
+            textvariable=row_data.format_var,
             width=12
         )
         format_entry.grid(row=row_num, column=6, padx=5, pady=2)
-        format_entry.bind("<KeyRelease>", lambda e, idx=row_index: self._on_mapping_changed(idx))
-        format_entry.bind("<Button-1>", lambda e, idx=row_index: self.show_format_dialog(idx))
-        row_data['widgets']['format_entry'] = format_entry
-        row_data['format_var'] = format_var
+        self._bind_row_widget(format_entry, row_data, 'format')
+        row_data.widgets['format_entry'] = format_entry
         
         # Action buttons frame
         action_frame = ttk.Frame(self.scrollable_frame)
@@ -338,126 +701,205 @@ class ColumnMapper(ttk.Frame):
         up_btn = ttk.Button(
             order_frame,
             text="↑",
-            command=lambda idx=row_index: self.move_row_up(idx),
             width=2
         )
         up_btn.pack(side=tk.LEFT, padx=(0, 1))
-        row_data['widgets']['up_btn'] = up_btn
+        self._bind_row_widget(up_btn, row_data, 'up')
+        row_data.widgets['up_btn'] = up_btn
         
         # Move down button
         down_btn = ttk.Button(
             order_frame,
             text="↓",
-            command=lambda idx=row_index: self.move_row_down(idx),
             width=2
         )
         down_btn.pack(side=tk.LEFT, padx=(0, 2))
-        row_data['widgets']['down_btn'] = down_btn
+        self._bind_row_widget(down_btn, row_data, 'down')
+        row_data.widgets['down_btn'] = down_btn
         
         
         # Advanced settings button
         advanced_btn = ttk.Button(
             action_frame,
             text="...",
-            command=lambda idx=row_index: self.show_advanced_settings(idx),
             width=3
         )
         advanced_btn.pack(side=tk.LEFT, padx=(0, 2))
-        row_data['widgets']['advanced_btn'] = advanced_btn
+        self._bind_row_widget(advanced_btn, row_data, 'advanced')
+        row_data.widgets['advanced_btn'] = advanced_btn
         
         # Delete button
         delete_btn = ttk.Button(
             action_frame,
             text="×",
-            command=lambda idx=row_index: self.remove_mapping_row(idx),
             width=3
         )
         delete_btn.pack(side=tk.LEFT)
-        row_data['widgets']['delete_btn'] = delete_btn
-        row_data['widgets']['action_frame'] = action_frame
-        
-        # Advanced settings (initially empty)
-        row_data['advanced_settings'] = {}
-        
-        self.mapping_rows.append(row_data)
-        self.update_button_states()
-        self.update_canvas_scroll()
-        
-        # Trigger callback
-        self._on_mapping_changed(row_index)
+        self._bind_row_widget(delete_btn, row_data, 'delete')
+        row_data.widgets['delete_btn'] = delete_btn
+        row_data.widgets['action_frame'] = action_frame
+        
+        # Pooled widgets keep their tags, so this runs once per widget set
+        for widget in row_data.widgets.values():
+            self._add_scroll_tag(widget)
+        
+        if not self._row_measured:
+            self._measure_row_height(row_data)
+            
+    def _reuse_row_widgets(self, row_data: MappingRow):
+        """Attach a pooled widget set to a row and show it at the row's grid row."""
+        widgets = self._row_pool.pop()
+        row_data.widgets = widgets
+        widgets['row_label'].configure(text=str(self._row_order.index(row_data.row_id) + 1))
+        for name, var_name in self._ROW_VARIABLES:
+            widgets[name].configure(textvariable=getattr(row_data, var_name))
+        for name, role in self._ROW_ROLES.items():
+            self._widget_rows[str(widgets[name])] = (row_data, role)
+        for name in self._ROW_GRIDDED:
+            # grid_remove kept the column, sticky and padding options
+            widgets[name].grid(row=row_data.slot)
+            
+    def _bind_row_widget(self, widget, row_data: MappingRow, role: str):
+        """
+        Route a row widget through the shared command and bind tag.
         
-    def move_row_up(self, index: int):
+        Args:
+            widget: Button, entry or combobox of a mapping row
+            row_data: Mapping row the widget belongs to
+            role: What the widget does, used by the dispatchers
+        """
+        self._widget_rows[str(widget)] = (row_data, role)
+        if isinstance(widget, ttk.Button):
+            widget.configure(command=(self._row_command, str(widget)))
+        else:
+            widget.bindtags((self._row_tag,) + widget.bindtags())
+            
+    def _is_width_text(self, text: str) -> bool:
+        """Accept only digits (or nothing) as typed into a width entry."""
+        return text == "" or text.isdecimal()
+        
+    def _on_row_command(self, widget_name: str):
+        """Dispatch a row button press to its action."""
+        row_data, role = self._widget_rows[widget_name]
+        row_id = row_data.row_id
+        if role == 'build':
+            self.show_expression_builder(row_id)
+        elif role == 'up':
+            self.move_row_up(row_id)
+        elif role == 'down':
+            self.move_row_down(row_id)
+        elif role == 'advanced':
+            self.show_advanced_settings(row_id)
+        elif role == 'delete':
+            self.remove_mapping_row(row_id)
+            
+    def _on_row_key(self, event):
+        """Schedule a change notification when a row entry is edited."""
+        row_data, role = self._widget_rows.get(str(event.widget), (None, None))
+        if role in ('output', 'width', 'format'):
+            self._schedule_changed(row_data.row_id)
+            
+    def _on_row_selected(self, event):
+        """Notify listeners when a row's alignment is picked."""
+        row_data, role = self._widget_rows.get(str(event.widget), (None, None))
+        if role == 'align':
+            self._on_mapping_changed(row_data.row_id)
+            
+    def _on_row_click(self, event):
+        """Open the format dialog when a row's format entry is clicked."""
+        row_data, role = self._widget_rows.get(str(event.widget), (None, None))
+        if role == 'format':
+            self.show_format_dialog(row_data.row_id)
+            
+    def _measure_row_height(self, row_data: MappingRow):
+        """Measure the height of a built row and reserve it for every row."""
+        widgets = row_data.widgets
+        tallest = max(widgets[name].winfo_reqheight() for name in (
+            'build_btn', 'input_display', 'output_entry', 'align_combo',
+            'width_entry', 'format_entry', 'advanced_btn'))
+        if tallest <= 1:
+            return  # Not measured yet, try again with the next row
+        self._row_measured = True
+        if tallest + 4 == self._row_height:
+            return  # The estimate was right
+        self._row_height = tallest + 4  # pady=2 above and below
+        for other in self.mapping_rows.values():
+            self.scrollable_frame.grid_rowconfigure(other.slot, minsize=self._row_height)
+        
+    def move_row_up(self, row_id: int):
         """Move a row up in the order."""
-        if index == 0:
+        position = self._row_order.index(row_id)
+        if position == 0:
             return  # Already at top
             
-        # Swap rows
-        self.mapping_rows[index], self.mapping_rows[index - 1] = self.mapping_rows[index - 1], self.mapping_rows[index]
+        self._swap_rows(position - 1, position)
+        self._on_mapping_changed(row_id)  # Notify of change
         
-        # Update row numbers and positions
-        self._refresh_row_positions()
-        self._update_order_numbers()
-        self._on_mapping_changed(index - 1)  # Notify of change
-        
-    def move_row_down(self, index: int):
+    def move_row_down(self, row_id: int):
         """Move a row down in the order."""
-        if index == len(self.mapping_rows) - 1:
+        position = self._row_order.index(row_id)
+        if position == len(self._row_order) - 1:
             return  # Already at bottom
             
-        # Swap rows
-        self.mapping_rows[index], self.mapping_rows[index + 1] = self.mapping_rows[index + 1], self.mapping_rows[index]
+        self._swap_rows(position, position + 1)
+        self._on_mapping_changed(row_id)  # Notify of change
         
-        # Update row numbers and positions
-        self._refresh_row_positions()
-        self._update_order_numbers()
-        self._on_mapping_changed(index + 1)  # Notify of change
+    def _swap_rows(self, upper: int, lower: int):
+        """
+        Swap two adjacent rows in the display order and in the grid.
         
-            
-    def _refresh_row_positions(self):
-        """Refresh the grid positions of all rows."""
-        for i, row_data in enumerate(self.mapping_rows):
-            row_num = i + 2  # +2 because of header and separator
-            row_data['index'] = i
-            
-            # Update button callbacks to use current index
-            if 'up_btn' in row_data['widgets']:
-                row_data['widgets']['up_btn'].config(command=lambda idx=i: self.move_row_up(idx))
-            if 'down_btn' in row_data['widgets']:
-                row_data['widgets']['down_btn'].config(command=lambda idx=i: self.move_row_down(idx))
-            
-            # Update all widgets in this row
-            for widget_name, widget in row_data['widgets'].items():
-                if hasattr(widget, 'grid_info'):
-                    grid_info = widget.grid_info()
-                    if grid_info:  # If widget is gridded
-                        widget.grid(row=row_num, column=grid_info['column'], 
-                                  sticky=grid_info.get('sticky', ''), 
-                                  padx=grid_info.get('padx', 0), 
-                                  pady=grid_info.get('pady', 0))
-                                  
-    def _update_order_numbers(self):
-        """Update the order numbers for all rows."""
-        for i, row_data in enumerate(self.mapping_rows):
-            # Update the # column (row_label) to show current visual position
-            row_data['widgets']['row_label'].config(text=str(i + 1))
-            
-    def remove_mapping_row(self, index: int):
+        Args:
+            upper: Display position of the upper row
+            lower: Display position of the lower row
+        """
+        order = self._row_order
+        upper_row = self.mapping_rows[order[upper]]
+        lower_row = self.mapping_rows[order[lower]]
+        order[upper], order[lower] = order[lower], order[upper]
+        upper_row.slot, lower_row.slot = lower_row.slot, upper_row.slot
+        for row_data in (upper_row, lower_row):
+            self._slot_rows[row_data.slot] = row_data.row_id
+            # Rebuild the row at its new grid row if it is on screen
+            if row_data.row_id in self._built_rows:
+                self._dematerialize_row(row_data.row_id)
+                self._built_rows.discard(row_data.row_id)
+        self._config_cache = None
+        self._update_visible_rows()
+        
+    def _redraw_row_numbers(self, after_slot: int = -1):
+        """
+        Update the order numbers of the rows that have widgets.
+        
+        Args:
+            after_slot: Only rows below this grid row are renumbered; slots
+                follow the display order, so rows above keep their numbers
+        """
+        for row_id in self._built_rows:
+            row_data = self.mapping_rows[row_id]
+            if row_data.slot > after_slot:
+                # Update the # column (row_label) to show current visual position
+                label = row_data.widgets['row_label']
+                label.config(text=str(self._row_order.index(row_id) + 1))
+            
+    def remove_mapping_row(self, row_id: int):
         """Remove a specific mapping row."""
-        if 0 <= index < len(self.mapping_rows):
-            # Remove widgets
-            row_data = self.mapping_rows[index]
-            for widget in row_data['widgets'].values():
-                if hasattr(widget, 'destroy'):
-                    widget.destroy()
+        if row_id in self.mapping_rows:
+            # Remove widgets; the rows below keep their grid rows
+            self._dematerialize_row(row_id)
+            self._built_rows.discard(row_id)
                     
-            # Remove from list
-            del self.mapping_rows[index]
-            
-            # Update indices and row numbers
-            self._refresh_row_positions()
-            self._update_order_numbers()
+            # Remove from the row model
+            row_data = self.mapping_rows.pop(row_id)
+            del self._slot_rows[row_data.slot]
+            self.scrollable_frame.grid_rowconfigure(row_data.slot, minsize=0)
+            self._row_order.remove(row_id)
+            self._config_cache = None
+            
+            # Update the numbers of the rows below the removed one
+            self._redraw_row_numbers(row_data.slot)
             self.update_button_states()
-            self.update_canvas_scroll()
+            if not self._bulk:
+                self._update_visible_rows()
             
             # Trigger callback
             if self.on_mapping_changed:
@@ -465,96 +907,100 @@ class ColumnMapper(ttk.Frame):
                 
     def remove_last_row(self):
         """Remove the last mapping row."""
-        if self.mapping_rows:
-            self.remove_mapping_row(len(self.mapping_rows) - 1)
+        if self._row_order:
+            self.remove_mapping_row(self._row_order[-1])
             
     def clear_all_mappings(self):
         """Clear all mapping rows."""
         if messagebox.askyesno("Confirm", "Are you sure you want to clear all column mappings?"):
-            # Remove all rows
-            for row_data in self.mapping_rows:
-                for widget in row_data['widgets'].values():
-                    if hasattr(widget, 'destroy'):
-                        widget.destroy()
-                        
-            self.mapping_rows.clear()
-            self.update_button_states()
-            self.update_canvas_scroll()
-            
-            # Add one empty row
-            self.add_mapping_row()
+            try:
+                self._begin_bulk()
+                
+                # Remove all rows
+                self._clear_rows()
+                
+                # Add one empty row
+                self.add_mapping_row()
+            finally:
+                self._end_bulk()
+                
+    def _begin_bulk(self):
+        """Suspend scroll, button and callback updates while rows change in bulk."""
+        self._bulk = True
+        self.canvas.configure(yscrollcommand="")
+        
+    def _end_bulk(self):
+        """Resume updates and run the suspended ones once."""
+        self._bulk = False
+        self.canvas.configure(yscrollcommand=self._on_canvas_scrolled)
+        self.update_button_states()
+        self.update_canvas_scroll()
+        self._update_visible_rows()
+        self._on_mapping_changed(-1)
             
     def refresh_row_display(self):
         """Refresh the display of all rows after deletion."""
-        for i, row_data in enumerate(self.mapping_rows):
-            row_data['index'] = i
-            
-            # Update row number
-            row_data['widgets']['row_label'].config(text=str(i + 1))
-            
-            # Update button callbacks to use current index
-            if 'up_btn' in row_data['widgets']:
-                row_data['widgets']['up_btn'].config(command=lambda idx=i: self.move_row_up(idx))
-            if 'down_btn' in row_data['widgets']:
-                row_data['widgets']['down_btn'].config(command=lambda idx=i: self.move_row_down(idx))
-            
-            # Update grid positions
-            row_num = i + 2  # +2 for header and separator
-            for widget in row_data['widgets'].values():
-                if hasattr(widget, 'grid_info') and widget.grid_info():
-                    info = widget.grid_info()
-                    widget.grid(row=row_num, column=info['column'], 
-                              sticky=info.get('sticky', ''),
-                              padx=info.get('padx', 0),
-                              pady=info.get('pady', 0))
+        self._redraw_row_numbers()
+        self._update_visible_rows()
                               
-    def show_advanced_settings(self, index: int):
+    def show_advanced_settings(self, row_id: int):
         """Show advanced settings dialog for a column."""
-        if 0 <= index < len(self.mapping_rows):
+        if row_id in self.mapping_rows:
             AdvancedSettingsDialog(
                 self,
-                self.mapping_rows[index],
+                self.mapping_rows[row_id],
                 self._on_advanced_settings_changed
             )
             
-    def show_format_dialog(self, row_index: int):
+    def show_format_dialog(self, row_id: int):
         """Show format dialog for the specified row."""
-        if 0 <= row_index < len(self.mapping_rows) and not self.format_dialog_open:
+        if row_id in self.mapping_rows and not self.format_dialog_open:
             self.format_dialog_open = True
-            row_data = self.mapping_rows[row_index]
+            row_data = self.mapping_rows[row_id]
             FormatDialog(self, row_data, self._on_format_dialog_closed)
             
-    def _on_format_dialog_closed(self, row_index: int):
+    def _on_format_dialog_closed(self, row_id: int):
         """Handle format dialog closure."""
         self.format_dialog_open = False
-        self._on_mapping_changed(row_index)
+        self._on_mapping_changed(row_id)
             
-    def show_expression_builder(self, index: int):
+    def show_expression_builder(self, row_id: int):
         """Show expression builder dialog for a column."""
-        if 0 <= index < len(self.mapping_rows):
-            # Get current output columns for formula building
-            output_columns = [row['output_var'].get() for row in self.mapping_rows 
-                            if row['output_var'].get().strip() and row != self.mapping_rows[index]]
+        if row_id in self.mapping_rows:
+            # Get current output columns for formula building from the cached
+            # row configs; only rows edited since the last call are re-read
+            self.get_configuration()
+            output_columns = [self.mapping_rows[other].config['name'] for other in self._row_order
+                            if other != row_id and self.mapping_rows[other].config is not None]
             
             ExpressionBuilderDialog(
                 self,
-                self.mapping_rows[index],
+                self.mapping_rows[row_id],
                 self.input_columns,
                 self._on_expression_changed,
                 output_columns
             )
             
-    def _on_expression_changed(self, index: int):
+    def _on_expression_changed(self, row_id: int):
         """Handle changes from expression builder."""
-        self._on_mapping_changed(index)
+        self._mark_row_dirty(self.mapping_rows[row_id])
+        self._on_mapping_changed(row_id)
 
     def show_examples(self):
         """Show examples of different mapping types."""
+        # The window is built once and only hidden on close
+        if self._examples_window is not None and self._examples_window.winfo_exists():
+            self._examples_window.deiconify()
+            self._examples_window.lift()
+            return
+            
         examples_window = tk.Toplevel(self)
+        self._examples_window = examples_window
         examples_window.title("Column Mapping Examples")
         examples_window.geometry("600x400")
         examples_window.resizable(True, True)
         examples_window.transient(self)
+        examples_window.protocol("WM_DELETE_WINDOW", examples_window.withdraw)
         
         # Create main frame with scrollbar
         main_frame = ttk.Frame(examples_window, padding=10)
@@ -575,64 +1021,29 @@ class ColumnMapper(ttk.Frame):
         text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # Examples content
-        examples_text = """
-COLUMN MAPPING EXAMPLES
-
-1. DIRECT MAPPING
-   Input Column: Name
-   → Maps the "Name" column directly to output
-   
-2. EMPTY/BLANK COLUMNS  
-   Input Column: (leave blank or empty)
-   → Creates empty column in output
-   
-3. FORMULAS (using output column names)
-   Input Column: =Chk Amt - Gross - Fica
-   → Calculates: Check Amount minus Gross minus FICA
-   
-   Input Column: =Gross * 0.15
-   → Calculates: Gross times 0.15 (15%)
-   
-
-5. PRACTICAL EXAMPLES:
-
-   For Payroll Processing:
-   • Employee Name → Name (direct mapping)
-   • Check # → (blank for manual entry)  
-   • Net Pay → Chk Amt (direct mapping)
-   • Adjusted Gross → Gross (direct mapping)
-   • Employee taxes - SS + Employee taxes - Med → Fica E/R
-   • =Chk Amt - Gross - Fica → Liab (calculated liability)
-   • Pay Date → Date (direct mapping)
-   • Time Period → Period (direct mapping)
-
-TIPS:
-• For formulas (=), use OUTPUT column names as they appear in your mapping
-• Leave input blank to create empty columns for manual data entry
-• Use the "..." button for advanced formatting (colors, number formats, etc.)
-• Preview your output before processing to verify mappings
-"""
-        
-        text_widget.insert(1.0, examples_text.strip())
+        text_widget.insert(1.0, MAPPING_EXAMPLES_TEXT)
         text_widget.config(state=tk.DISABLED)
         
         # Close button
-        ttk.Button(main_frame, text="Close", command=examples_window.destroy).pack(pady=(10, 0))
+        ttk.Button(main_frame, text="Close", command=examples_window.withdraw).pack(pady=(10, 0))
             
-    def _on_advanced_settings_changed(self, index: int):
+    def _on_advanced_settings_changed(self, row_id: int):
         """Handle changes in advanced settings."""
-        self._on_mapping_changed(index)
+        self._mark_row_dirty(self.mapping_rows[row_id])
+        self._on_mapping_changed(row_id)
         
     def update_button_states(self):
         """Update the state of control buttons."""
+        if self._bulk:
+            return
         has_rows = len(self.mapping_rows) > 0
         self.remove_row_btn.config(state=tk.NORMAL if has_rows else tk.DISABLED)
         
     def update_canvas_scroll(self):
-        """Update canvas scroll region."""
-        self.canvas.update_idletasks()
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        """Update canvas scroll region from the tracked content size."""
+        if self._bulk:
+            return
+        self.canvas.configure(scrollregion=(0, 0, self._content_width, self._content_height))
         
     def set_input_columns(self, columns: List[str]):
         """Set available input columns."""
@@ -647,118 +1058,156 @@ TIPS:
         
     def has_valid_mapping(self) -> bool:
         """Check if there is at least one valid column mapping."""
-        for row_data in self.mapping_rows:
-            output_name = row_data['output_var'].get().strip()
+        for row_data in self.mapping_rows.values():
+            output_name = row_data.output_var.get().strip()
             if output_name:
                 return True
         return False
         
-    def _on_mapping_changed(self, index: int):
+    def _schedule_changed(self, row_id: int, delay: int = MAPPING_CHANGE_DELAY):
+        """
+        Notify listeners once typing pauses instead of on every keystroke.
+        
+        Args:
+            row_id: Id of the row being edited
+            delay: Milliseconds of inactivity before notifying
+        """
+        if self._pending_after:
+            self.after_cancel(self._pending_after)
+        self._pending_after = self.after(delay, self._on_mapping_changed, row_id)
+        
+    def _on_mapping_changed(self, row_id: int):
         """Handle mapping changes."""
-        if self.on_mapping_changed:
+        if self._pending_after:
+            # This notification supersedes the debounced one
+            self.after_cancel(self._pending_after)
+            self._pending_after = None
+        if self.on_mapping_changed and not self._bulk:
             config = self.get_configuration()
             self.on_mapping_changed(config)
             
+    def _mark_row_dirty(self, row_data: MappingRow):
+        """Invalidate the cached config of a row and the configuration list."""
+        row_data.config_dirty = True
+        self._config_cache = None
+        
     def get_configuration(self) -> Dict[str, Any]:
-        """Get current mapping configuration."""
-        output_columns = []
+        """
+        Get current mapping configuration.
         
-        for row_data in self.mapping_rows:
-            output_name = row_data['output_var'].get().strip()
-            if not output_name:
-                continue
-                
-            # Get the actual source column for processing (not display text)
-            if 'expression_parts' in row_data and 'expression' in row_data['expression_parts']:
-                # Use stored expression (empty for blank columns)
-                source_column = row_data['expression_parts']['expression']
-            else:
-                # Fallback to display text (for backward compatibility)
-                display_text = row_data['input_var'].get()
-                source_column = "" if display_text == "(empty column)" else display_text
-                
-            alignment = row_data['align_var'].get()
-            
-            try:
-                width = int(row_data['width_var'].get() or 15)
-            except ValueError:
-                width = 15
-                
-            # Get format value
-            format_value = row_data['format_var'].get() or "General"
-            
-            # Update formatting with number_format
-            formatting = row_data.get('advanced_settings', {}).copy()
-            formatting['number_format'] = format_value
-            
-            column_config = {
-                "name": output_name,
-                "source_column": source_column,
-                "alignment": alignment,
-                "width": width,
-                "formatting": formatting
-            }
-            
-            output_columns.append(column_config)
+        Column configs are cached per row and only rebuilt for rows edited
+        since the last call, so repeated calls skip the StringVar reads.
+        """
+        if self._config_cache is None:
+            output_columns = []
+            for row_id in self._row_order:
+                row_data = self.mapping_rows[row_id]
+                if row_data.config_dirty:
+                    row_data.config = self._build_column_config(row_data)
+                    row_data.config_dirty = False
+                if row_data.config is not None:
+                    output_columns.append(row_data.config)
+            self._config_cache = output_columns
+            
+        return {"output_columns": list(self._config_cache)}
+        
+    def _build_column_config(self, row_data: MappingRow) -> Optional[Dict[str, Any]]:
+        """
+        Build the output column config of a row.
+        
+        Args:
+            row_data: Mapping row
             
-        return {"output_columns": output_columns}
+        Returns:
+            Column config, or None if the row has no output name
+        """
+        output_name = row_data.output_var.get().strip()
+        if not output_name:
+            return None
+        
+        # Get the actual source column for processing (not display text)
+        if 'expression' in row_data.expression_parts:
+            # Use stored expression (empty for blank columns)
+            source_column = row_data.expression_parts['expression']
+        else:
+            # Fallback to display text (for backward compatibility)
+            display_text = row_data.input_var.get()
+            source_column = "" if display_text == "(empty column)" else display_text
         
-    def set_configuration(self, config: Dict[str, Any]):
-        """Set mapping configuration from config dict."""
-        # Clear existing mappings
-        for row_data in self.mapping_rows:
-            for widget in row_data['widgets'].values():
-                if hasattr(widget, 'destroy'):
-                    widget.destroy()
-                    
-        self.mapping_rows.clear()
+        alignment = row_data.align_var.get()
         
-        # Add rows from configuration
-        output_columns = config.get("output_columns", [])
+        # Typed widths are digits only; loaded configs may still hold anything
+        width_text = row_data.width_var.get()
+        width = int(width_text) if width_text.isdecimal() else 15
         
-        if not output_columns:
-            # Add one empty row if no configuration
-            self.add_mapping_row()
-            return
-            
-        for col_config in output_columns:
-            self.add_mapping_row()
-            row_data = self.mapping_rows[-1]
-            
-            # Set values
-            source_column = col_config.get("source_column", "")
-            # Handle empty columns - display "(empty column)" for empty source columns
-            if not source_column or source_column == "(empty column)":
-                row_data['input_var'].set("(empty column)")
-            else:
-                row_data['input_var'].set(source_column)
-            row_data['output_var'].set(col_config.get("name", ""))
-            row_data['align_var'].set(col_config.get("alignment", "left"))
-            row_data['width_var'].set(str(col_config.get("width", 15)))
+        # Get format value
+        format_value = row_data.format_var.get() or _DEFAULT_FORMAT
+        
+        # Update formatting with number_format
+        formatting = row_data.advanced_settings.copy()
+        formatting['number_format'] = format_value
+        
+        column_config = {
+            "name": output_name,
+            "source_column": source_column,
+            "alignment": alignment,
+            "width": width,
+            "formatting": formatting
+        }
+        
+        return column_config
+        
+    def set_configuration(self, config: Dict[str, Any]):
+        """Set mapping configuration from config dict."""
+        try:
+            self._begin_bulk()
             
-            # Handle format - get from formatting.number_format or default to General
-            formatting = col_config.get("formatting", {})
-            format_value = formatting.get("number_format", "General")
-            row_data['format_var'].set(format_value)
+            # Clear existing mappings
+            self._clear_rows()
             
-            row_data['advanced_settings'] = formatting
+            # Add rows from configuration
+            output_columns = config.get("output_columns", [])
             
-        # Update order numbers
-        self._update_order_numbers()
-        self.update_button_states()
-        self.update_canvas_scroll()
+            if not output_columns:
+                # Add one empty row if no configuration
+                self.add_mapping_row()
+                return
+                
+            for col_config in output_columns:
+                row_data = self.add_mapping_row()
+                
+                # Set values
+                source_column = col_config.get("source_column", "")
+                # Handle empty columns - display "(empty column)" for empty source columns
+                if not source_column or source_column == "(empty column)":
+                    row_data.input_var.set("(empty column)")
+                else:
+                    row_data.input_var.set(source_column)
+                row_data.output_var.set(col_config.get("name", ""))
+                row_data.align_var.set(col_config.get("alignment", _DEFAULT_ALIGN))
+                row_data.width_var.set(str(col_config.get("width", 15)))
+                
+                # Handle format - get from formatting.number_format or default to General
+                formatting = col_config.get("formatting", {})
+                format_value = formatting.get("number_format", _DEFAULT_FORMAT)
+                row_data.format_var.set(format_value)
+                
+                row_data.advanced_settings = formatting
+        finally:
+            # Update scroll region, buttons and listeners once for all rows
+            self._end_bulk()
 
 
 class FormatDialog:
     """Dialog for selecting Excel-style number formats."""
     
-    def __init__(self, parent, row_data: Dict[str, Any], callback: Callable[[int], None]):
+    def __init__(self, parent, row_data: MappingRow, callback: Callable[[int], None]):
         """
         Initialize format dialog.
         
         Args:
             parent: Parent widget
-            row_data: Row data containing format information
+            row_data: Mapping row containing format information
             callback: Callback function when format changes
         """
         self.parent = parent
@@ -770,6 +1219,7 @@ class FormatDialog:
         self.dialog.title("Number Format")
         self.dialog.geometry("700x600")
         self.dialog.resizable(True, True)
+        self._pending_after = None  # Debounced custom format update
         
         # Center the dialog
         self.dialog.transient(parent)
@@ -786,7 +1236,7 @@ class FormatDialog:
         current_frame = ttk.LabelFrame(main_frame, text="Current Format", padding=10)
         current_frame.pack(fill=tk.X, pady=(0, 15))
         
-        self.current_format_var = tk.StringVar(value=row_data['format_var'].get())
+        self.current_format_var = tk.StringVar(value=row_data.format_var.get())
         current_entry = ttk.Entry(current_frame, textvariable=self.current_format_var, 
                                  font=("Consolas", 10), width=50)
         current_entry.pack(fill=tk.X)
@@ -826,78 +1276,10 @@ class FormatDialog:
         
     def create_predefined_formats(self):
         """Create predefined format categories."""
-        # General
-        general_frame = ttk.Frame(self.notebook)
-        self.notebook.add(general_frame, text="General")
-        
-        general_formats = [
-            ("General", "General"),
-            ("Number", "#,##0"),
-            ("Number (2 decimals)", "#,##0.00"),
-            ("Currency", '"$"#,##0.00'),
-            ("Percentage", "0%"),
-            ("Percentage (2 decimals)", "0.00%"),
-            ("Date", "mm/dd/yyyy"),
-            ("Time", "h:mm AM/PM"),
-            ("Text", "@")
-        ]
-        
-        self.create_format_buttons(general_frame, general_formats)
-        
-        # Number formats
-        number_frame = ttk.Frame(self.notebook)
-        self.notebook.add(number_frame, text="Number")
-        
-        number_formats = [
-            ("0", "0"),
-            ("0.0", "0.0"),
-            ("0.00", "0.00"),
-            ("#,##0", "#,##0"),
-            ("#,##0.0", "#,##0.0"),
-            ("#,##0.00", "#,##0.00"),
-            ("0.0%", "0.0%"),
-            ("0.00%", "0.00%"),
-            ("0.000%", "0.000%")
-        ]
-        
-        self.create_format_buttons(number_frame, number_formats)
-        
-        # Currency formats
-        currency_frame = ttk.Frame(self.notebook)
-        self.notebook.add(currency_frame, text="Currency")
-        
-        currency_formats = [
-            ('$0', '"$"0'),
-            ('$0.00', '"$"0.00'),
-            ('$#,##0', '"$"#,##0'),
-            ('$#,##0.00', '"$"#,##0.00'),
-            ('$#,##0.00_);($#,##0.00)', '"$"#,##0.00_);("$"#,##0.00)'),
-            ('$0.00_);($0.00)', '"$"0.00_);("$"0.00)'),
-            ('(#,##0.00)', '(#,##0.00) - Accounting Format'),
-            ('-(#,##0.00)', '-(#,##0.00) - Negative Outside Parentheses'),
-            ('(#,##0)', '(#,##0) - Accounting Format (no decimals)')
-        ]
-        
-        self.create_format_buttons(currency_frame, currency_formats)
-        
-        # Date formats
-        date_frame = ttk.Frame(self.notebook)
-        self.notebook.add(date_frame, text="Date")
-        
-        date_formats = [
-            ("mm/dd/yyyy", "mm/dd/yyyy"),
-            ("m/d/yy", "m/d/yy"),
-            ("mm-dd-yyyy", "mm-dd-yyyy"),
-            ("d-mmm-yy", "d-mmm-yy"),
-            ("d-mmm", "d-mmm"),
-            ("mmm-yy", "mmm-yy"),
-            ("h:mm AM/PM", "h:mm AM/PM"),
-            ("h:mm:ss AM/PM", "h:mm:ss AM/PM"),
-            ("h:mm", "h:mm"),
-            ("h:mm:ss", "h:mm:ss")
-        ]
-        
-        self.create_format_buttons(date_frame, date_formats)
+        for title, formats in _FORMAT_CATEGORIES:
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=title)
+            self.create_format_buttons(frame, formats)
         
     def create_custom_format(self):
         """Create custom format tab."""
@@ -905,15 +1287,7 @@ class FormatDialog:
         self.notebook.add(custom_frame, text="Custom")
         
         # Instructions
-        instructions = ttk.Label(custom_frame, 
-            text="Enter a custom Excel format code:\n\n"
-                 "Examples:\n"
-                 "• #,##0.00 - Number with thousands separator and 2 decimals\n"
-                 "• \"$\"#,##0.00 - Currency with dollar sign\n"
-                 "• 0.00% - Percentage with 2 decimals\n"
-                 "• mm/dd/yyyy - Date format\n"
-                 "• @ - Text format\n\n"
-                 "For more help, see Excel's Format Cells dialog.",
+        instructions = ttk.Label(custom_frame, text=_CUSTOM_INSTRUCTIONS_TEXT,
             justify=tk.LEFT, font=("Segoe UI", 9))
         instructions.pack(anchor=tk.W, pady=(0, 10))
         
@@ -926,7 +1300,7 @@ class FormatDialog:
         custom_entry = ttk.Entry(custom_frame_inner, textvariable=self.custom_format_var,
                                 font=("Consolas", 10), width=50)
         custom_entry.pack(fill=tk.X, pady=(5, 0))
-        custom_entry.bind('<KeyRelease>', lambda e: self.current_format_var.set(self.custom_format_var.get()))
+        custom_entry.bind('<KeyRelease>', self._schedule_custom_format)
         
     def create_format_buttons(self, parent, formats):
         """Create format selection buttons."""
@@ -935,9 +1309,17 @@ class FormatDialog:
         scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
         
+        # Create buttons before the frame is placed in the canvas, so it is
+        # laid out once with all of them
+        for display_name, format_code in formats:
+            btn = ttk.Button(scrollable_frame, text=display_name,
+                           command=functools.partial(self.select_format, format_code))
+            btn.pack(fill=tk.X, padx=5, pady=2)
+            
+        # The event carries the frame's size, so no bbox("all") is needed
         scrollable_frame.bind(
             "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            lambda e: canvas.configure(scrollregion=(0, 0, e.width, e.height))
         )
         
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
@@ -945,12 +1327,6 @@ class FormatDialog:
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
-        
-        # Create buttons
-        for i, (display_name, format_code) in enumerate(formats):
-            btn = ttk.Button(scrollable_frame, text=display_name,
-                           command=lambda code=format_code: self.select_format(code))
-            btn.pack(fill=tk.X, padx=5, pady=2)
             
     def select_format(self, format_code):
         """Select a format code."""
@@ -962,50 +1338,50 @@ class FormatDialog:
             # This is a simplified preview - in a real implementation,
             # you'd want to use a library that can actually format numbers
             # according to Excel format codes
-            format_code = self.current_format_var.get()
-            if format_code:
-                # Basic preview logic
-                if "0.00" in format_code:
-                    self.preview_var.set("1,234.56")
-                elif "0.0" in format_code:
-                    self.preview_var.set("1,234.5")
-                elif "0" in format_code and "#" in format_code:
-                    self.preview_var.set("1,234")
-                elif "%" in format_code:
-                    self.preview_var.set("12.34%")
-                elif "$" in format_code:
-                    self.preview_var.set("$1,234.56")
-                elif "mm" in format_code or "dd" in format_code:
-                    self.preview_var.set("12/25/2023")
-                else:
-                    self.preview_var.set("1234.5678")
-            else:
-                self.preview_var.set("1234.5678")
+            self.preview_var.set(_preview_for(self.current_format_var.get()))
         except:
-            self.preview_var.set("1234.5678")
+            self.preview_var.set(_DEFAULT_PREVIEW)
             
+    def _schedule_custom_format(self, event=None):
+        """Use the typed custom format once typing pauses."""
+        if self._pending_after:
+            self.dialog.after_cancel(self._pending_after)
+        self._pending_after = self.dialog.after(MAPPING_CHANGE_DELAY, self._use_custom_format)
+        
+    def _use_custom_format(self):
+        """Copy the custom format entry into the current format."""
+        self._pending_after = None
+        self.current_format_var.set(self.custom_format_var.get())
+        
     def apply_format(self):
         """Apply the selected format."""
+        if self._pending_after:
+            # Don't lose keystrokes typed just before applying
+            self.dialog.after_cancel(self._pending_after)
+            self._use_custom_format()
         format_code = self.current_format_var.get()
-        self.row_data['format_var'].set(format_code)
-        self.callback(self.row_data['index'])
+        self.row_data.format_var.set(format_code)
+        self.callback(self.row_data.row_id)
         self.dialog.destroy()
         
     def on_cancel(self):
         """Handle cancel or close."""
+        if self._pending_after:
+            self.dialog.after_cancel(self._pending_after)
+            self._pending_after = None
         self.dialog.destroy()
 
 
 class AdvancedSettingsDialog:
     """Dialog for advanced column formatting settings."""
     
-    def __init__(self, parent, row_data: Dict[str, Any], callback: Callable[[int], None]):
+    def __init__(self, parent, row_data: MappingRow, callback: Callable[[int], None]):
         """
         Initialize advanced settings dialog.
         
         Args:
             parent: Parent widget
-            row_data: Row data dictionary
+            row_data: Mapping row
             callback: Callback function when settings change
         """
         self.parent = parent
@@ -1013,7 +1389,7 @@ class AdvancedSettingsDialog:
         self.callback = callback
         
         self.dialog = tk.Toplevel(parent)
-        self.dialog.title(f"Advanced Settings - {row_data['output_var'].get()}")
+        self.dialog.title(f"Advanced Settings - {row_data.output_var.get()}")
         self.dialog.geometry("400x300")
         self.dialog.resizable(False, False)
         self.dialog.transient(parent)
@@ -1023,7 +1399,7 @@ class AdvancedSettingsDialog:
         self.center_dialog()
         
         # Current settings
-        self.settings = row_data.get('advanced_settings', {}).copy()
+        self.settings = row_data.advanced_settings.copy()
         
         self.create_widgets()
         
@@ -1104,10 +1480,10 @@ class AdvancedSettingsDialog:
         self.settings = {k: v for k, v in self.settings.items() if v or isinstance(v, bool)}
         
         # Update row data
-        self.row_data['advanced_settings'] = self.settings
+        self.row_data.advanced_settings = self.settings
         
         # Call callback
-        self.callback(self.row_data['index'])
+        self.callback(self.row_data.row_id)
         
         self.dialog.destroy()
         
@@ -1137,13 +1513,13 @@ class AdvancedSettingsDialog:
 class ExpressionBuilderDialog:
     """Dialog for building column mapping expressions step-by-step."""
     
-    def __init__(self, parent, row_data: Dict[str, Any], input_columns: List[str], callback: Callable[[int], None], output_columns: List[str] = None):
+    def __init__(self, parent, row_data: MappingRow, input_columns: List[str], callback: Callable[[int], None], output_columns: List[str] = None):
         """
         Initialize expression builder dialog.
         
         Args:
             parent: Parent widget
-            row_data: Row data dictionary
+            row_data: Mapping row
             input_columns: List of available input columns
             callback: Callback function when expression changes
             output_columns: List of available output columns (optional)
@@ -1152,20 +1528,34 @@ class ExpressionBuilderDialog:
         self.row_data = row_data
         self.input_columns = input_columns
         self.output_columns = output_columns or []
+        self.logger = logging.getLogger(__name__)
         self.callback = callback
         
+        # The column lists are fixed while the dialog is open, so the
+        # combobox widths are measured once
+        self._direct_width = self._combo_width(self.input_columns, 5, 20, 60, 30)
+        self._input_part_width = self._combo_width(self.input_columns, 2, 15, 40, 20)
+        self._output_part_width = self._combo_width(self.output_columns, 2, 15, 40, 20)
+        
         self.dialog = tk.Toplevel(parent)
-        self.dialog.title(f"Build Expression - {row_data['output_var'].get()}")
+        self.dialog.title(f"Build Expression - {row_data.output_var.get()}")
         self.dialog.geometry("700x500")
         self.dialog.resizable(True, True)
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
+        # Handle window close
+        self.dialog.protocol("WM_DELETE_WINDOW", self.on_cancel)
+        
         # Center dialog on parent
         self.center_dialog()
         
         # Current expression parts
-        self.expression_parts = row_data.get('expression_parts', []).copy()
+        self.expression_parts = row_data.expression_parts.copy()
+        self._pending_after = None  # Debounced expression display update
+        # Interfaces are built on first use, then only shown or hidden
+        self._mode_frames = {}  # Mapping mode -> frame
+        self._formula_frames = {}  # Formula builder type -> frame
         
         self.create_widgets()
         self.update_expression_display()
@@ -1200,8 +1590,9 @@ class ExpressionBuilderDialog:
         # Don't pack scrollbar initially - will be shown when needed
         
         # Bind mousewheel
-        canvas.bind("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1 * (e.delta / 120)), "units"))
-        self.scrollable_main_frame.bind("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1 * (e.delta / 120)), "units"))
+        scroll = functools.partial(_scroll_canvas, canvas)
+        canvas.bind("<MouseWheel>", scroll)
+        self.scrollable_main_frame.bind("<MouseWheel>", scroll)
         
         main_frame = self.scrollable_main_frame
         
@@ -1239,7 +1630,7 @@ class ExpressionBuilderDialog:
         button_frame.pack(fill=tk.X)
         
         ttk.Button(button_frame, text="OK", command=self.save_expression).pack(side=tk.RIGHT, padx=(5, 0))
-        ttk.Button(button_frame, text="Cancel", command=self.dialog.destroy).pack(side=tk.RIGHT)
+        ttk.Button(button_frame, text="Cancel", command=self.on_cancel).pack(side=tk.RIGHT)
         ttk.Button(button_frame, text="Clear", command=self.clear_expression).pack(side=tk.LEFT)
         
         # Initialize content based on current mode
@@ -1248,7 +1639,7 @@ class ExpressionBuilderDialog:
         
     def detect_current_mode(self):
         """Detect current mode from existing expression."""
-        current_value = self.row_data['input_var'].get()
+        current_value = self.row_data.input_var.get()
         
         if not current_value:
             self.mode_var.set("direct")  # Default to direct mapping instead of blank
@@ -1259,54 +1650,52 @@ class ExpressionBuilderDialog:
             
     def on_mode_change(self):
         """Handle mode selection change."""
-        # Clear content frame
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-            
         mode = self.mode_var.get()
-        
-        if mode == "direct":
-            self.create_direct_mode()
-        elif mode == "blank":
-            self.create_blank_mode()
-        elif mode == "formula":
-            self.create_formula_mode()
+        frame = self._mode_frames.get(mode)
+        
+        if frame is None:
+            frame = ttk.Frame(self.content_frame)
+            self._mode_frames[mode] = frame
+            if mode == "direct":
+                self.create_direct_mode(frame)
+            elif mode == "blank":
+                self.create_blank_mode(frame)
+            elif mode == "formula":
+                self.create_formula_mode(frame)
+                
+        for other in self._mode_frames.values():
+            if other is not frame:
+                other.pack_forget()
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.update_expression_display()
             
-    def create_direct_mode(self):
+    def create_direct_mode(self, parent):
         """Create interface for direct column mapping."""
-        ttk.Label(self.content_frame, text="Select input column to map directly:").pack(anchor=tk.W, pady=(0, 10))
-        
-        # Calculate optimal width for input columns
-        if self.input_columns:
-            max_width = min(max(len(col) for col in self.input_columns) + 5, 60)  # +5 for padding, max 60
-            optimal_width = max(max_width, 20)  # minimum 20 chars
-        else:
-            optimal_width = 30
+        ttk.Label(parent, text="Select input column to map directly:").pack(anchor=tk.W, pady=(0, 10))
         
         self.direct_var = tk.StringVar()
-        direct_combo = ttk.Combobox(self.content_frame, textvariable=self.direct_var, 
-                                   values=self.input_columns, state="readonly", width=optimal_width)
+        direct_combo = ttk.Combobox(parent, textvariable=self.direct_var, 
+                                   values=self.input_columns, state="readonly", width=self._direct_width)
         direct_combo.pack(anchor=tk.W, pady=(0, 10))
         direct_combo.bind("<<ComboboxSelected>>", lambda e: self.update_expression_display())
         
         # Set current value if it's a direct mapping
-        current = self.row_data['input_var'].get()
+        current = self.row_data.input_var.get()
         if current in self.input_columns:
             self.direct_var.set(current)
             
-    def create_blank_mode(self):
+    def create_blank_mode(self, parent):
         """Create interface for blank columns."""
-        ttk.Label(self.content_frame, 
+        ttk.Label(parent, 
                  text="This will create an empty column in the output.\nUseful for manual data entry fields like Check #.",
                  justify=tk.LEFT).pack(anchor=tk.W, pady=10)
-        self.update_expression_display()
         
-    def create_formula_mode(self):
+    def create_formula_mode(self, parent):
         """Create interface for formula expressions."""
-        ttk.Label(self.content_frame, text="Build Formula Expression:").pack(anchor=tk.W, pady=(0, 10))
+        ttk.Label(parent, text="Build Formula Expression:").pack(anchor=tk.W, pady=(0, 10))
         
         # Formula builder frame
-        formula_frame = ttk.Frame(self.content_frame)
+        formula_frame = ttk.Frame(parent)
         formula_frame.pack(fill=tk.BOTH, expand=True)
         
         # Instructions
@@ -1355,7 +1744,7 @@ class ExpressionBuilderDialog:
         self.formula_content_frame.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
         
         # Set current value if it's a formula
-        current = self.row_data['input_var'].get()
+        current = self.row_data.input_var.get()
         if current.startswith("="):
             self.current_formula = current[1:]  # Remove =
         else:
@@ -1372,9 +1761,12 @@ class ExpressionBuilderDialog:
         
         self.column_info_label.config(text=info_text)
         
-        # Refresh formula interface to use new column source
-        if hasattr(self, 'formula_content_frame') and self.formula_content_frame.winfo_exists():
-            self.update_formula_interface()
+        # Point the existing formula parts at the new column source
+        if hasattr(self, 'formula_parts'):
+            columns = self.get_current_columns()
+            width = self.get_current_column_width()
+            for part in self.formula_parts.values():
+                part['col_combo'].config(values=columns, width=width)
     
     def get_current_columns(self):
         """Get the current column list based on selected source."""
@@ -1382,78 +1774,108 @@ class ExpressionBuilderDialog:
             return self.output_columns
         return self.input_columns
         
+    def get_current_column_width(self):
+        """Get the column combobox width for the selected source."""
+        if self.column_source.get() == "output" and self.output_columns:
+            return self._output_part_width
+        return self._input_part_width
+        
+    @staticmethod
+    def _combo_width(columns: List[str], padding: int, minimum: int, maximum: int, empty: int) -> int:
+        """
+        Size a combobox to its longest column name, within limits.
+        
+        Args:
+            columns: Column names shown in the combobox
+            padding: Characters added to the longest name
+            minimum: Smallest width in characters
+            maximum: Largest width in characters
+            empty: Width used when there are no columns
+            
+        Returns:
+            Combobox width in characters
+        """
+        if not columns:
+            return empty
+        return max(min(max(len(col) for col in columns) + padding, maximum), minimum)
+        
     def update_formula_interface(self):
         """Update formula interface based on selected type."""
-        # Clear content frame safely
-        try:
-            for widget in self.formula_content_frame.winfo_children():
-                widget.destroy()
-        except tk.TclError:
-            # Widget already destroyed, ignore
-            pass
-            
         formula_type = self.formula_type.get()
-        print(f"DEBUG: Updating formula interface to: {formula_type}")  # Debug line
-        
-        if formula_type == "visual":
-            self.create_visual_formula_builder()
-        else:
-            self.create_manual_formula_entry()
-            
-    def create_visual_formula_builder(self):
-        """Create visual formula builder with dropdowns."""
-        print("DEBUG: Creating visual formula builder")  # Debug line
-        try:
-            # Visual builder
-            visual_frame = ttk.Frame(self.formula_content_frame)
-            visual_frame.pack(fill=tk.X, pady=(0, 10))
-            
-            ttk.Label(visual_frame, text="Build your formula step by step:").pack(anchor=tk.W, pady=(0, 5))
-            
-            # Formula parts container with scrolling
-            self.formula_parts = []
-            
-            # Create scrollable frame for formula parts
-            parts_canvas_frame = ttk.Frame(visual_frame)
-            parts_canvas_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-            parts_canvas_frame.grid_rowconfigure(0, weight=1)
-            parts_canvas_frame.grid_columnconfigure(0, weight=1)
-            
-            parts_canvas = tk.Canvas(parts_canvas_frame, height=200, highlightthickness=0)
-            parts_scrollbar = ttk.Scrollbar(parts_canvas_frame, orient="vertical", command=parts_canvas.yview)
-            self.formula_parts_frame = ttk.Frame(parts_canvas)
-            
-            self.formula_parts_frame.bind(
-                "<Configure>",
-                lambda e: parts_canvas.configure(scrollregion=parts_canvas.bbox("all"))
-            )
-            
-            parts_canvas.create_window((0, 0), window=self.formula_parts_frame, anchor="nw")
-            parts_canvas.configure(yscrollcommand=parts_scrollbar.set)
-            
-            parts_canvas.grid(row=0, column=0, sticky="nsew")
-            parts_scrollbar.grid(row=0, column=1, sticky="ns")
-            
-            # Bind mousewheel for formula parts
-            parts_canvas.bind("<MouseWheel>", lambda e: parts_canvas.yview_scroll(int(-1 * (e.delta / 120)), "units"))
-            self.formula_parts_frame.bind("<MouseWheel>", lambda e: parts_canvas.yview_scroll(int(-1 * (e.delta / 120)), "units"))
-            
-            # Add first part
-            self.add_formula_part()
+        self.logger.debug("Updating formula interface to: %s", formula_type)
+        frame = self._formula_frames.get(formula_type)
+        
+        if frame is None:
+            frame = ttk.Frame(self.formula_content_frame)
+            if formula_type == "visual":
+                try:
+                    self.create_visual_formula_builder(frame)
+                except Exception as e:
+                    self.logger.debug("Error creating visual formula builder: %s", e)
+                    # Fallback to manual entry
+                    frame.destroy()
+                    self.formula_type.set("manual")
+                    self.update_formula_interface()
+                    return
+            else:
+                self.create_manual_formula_entry(frame)
+            self._formula_frames[formula_type] = frame
             
-            # Add part button
-            ttk.Button(visual_frame, text="Add More", 
-                      command=self.add_formula_part).pack(anchor=tk.W, pady=(5, 0))
+        for other in self._formula_frames.values():
+            if other is not frame:
+                other.pack_forget()
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.update_expression_display()
             
-            # Parse existing formula if it exists
-            if self.current_formula:
-                self.parse_existing_formula()
-                
-        except Exception as e:
-            print(f"DEBUG: Error creating visual formula builder: {e}")
-            # Fallback to manual entry
-            self.formula_type.set("manual")
-            self.create_manual_formula_entry()
+    def create_visual_formula_builder(self, parent):
+        """Create visual formula builder with dropdowns."""
+        self.logger.debug("Creating visual formula builder")
+        # Visual builder
+        visual_frame = ttk.Frame(parent)
+        visual_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(visual_frame, text="Build your formula step by step:").pack(anchor=tk.W, pady=(0, 5))
+        
+        # Formula parts container with scrolling, keyed by id(part_data) so
+        # removal needs no scan; dicts keep the parts in insertion order
+        self.formula_parts = {}
+        
+        # Create scrollable frame for formula parts
+        parts_canvas_frame = ttk.Frame(visual_frame)
+        parts_canvas_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        parts_canvas_frame.grid_rowconfigure(0, weight=1)
+        parts_canvas_frame.grid_columnconfigure(0, weight=1)
+        
+        parts_canvas = tk.Canvas(parts_canvas_frame, height=200, highlightthickness=0)
+        parts_scrollbar = ttk.Scrollbar(parts_canvas_frame, orient="vertical", command=parts_canvas.yview)
+        self.formula_parts_frame = ttk.Frame(parts_canvas)
+        
+        self.formula_parts_frame.bind(
+            "<Configure>",
+            lambda e: parts_canvas.configure(scrollregion=parts_canvas.bbox("all"))
+        )
+        
+        parts_canvas.create_window((0, 0), window=self.formula_parts_frame, anchor="nw")
+        parts_canvas.configure(yscrollcommand=parts_scrollbar.set)
+        
+        parts_canvas.grid(row=0, column=0, sticky="nsew")
+        parts_scrollbar.grid(row=0, column=1, sticky="ns")
+        
+        # Bind mousewheel for formula parts
+        scroll = functools.partial(_scroll_canvas, parts_canvas)
+        parts_canvas.bind("<MouseWheel>", scroll)
+        self.formula_parts_frame.bind("<MouseWheel>", scroll)
+        
+        # Add first part
+        self.add_formula_part()
+        
+        # Add part button
+        ttk.Button(visual_frame, text="Add More", 
+                  command=self.add_formula_part).pack(anchor=tk.W, pady=(5, 0))
+        
+        # Parse existing formula if it exists
+        if self.current_formula:
+            self.parse_existing_formula()
             
     def add_formula_part(self, initial_column="", initial_operator="+", initial_value=""):
         """Add a new part to the visual formula builder."""
@@ -1477,40 +1899,33 @@ class ExpressionBuilderDialog:
             part_data['op_combo'] = op_combo
         
         # Column or value selection
-        type_var = tk.StringVar(value="column" if initial_column else "column")
+        type_var = tk.StringVar(value="number" if initial_value and not initial_column else "column")
         ttk.Radiobutton(part_frame, text="Column:", variable=type_var, value="column",
-                       command=lambda: self.toggle_part_type(part_data)).pack(side=tk.LEFT)
+                       command=functools.partial(self.toggle_part_type, part_data)).pack(side=tk.LEFT)
         
         # Column dropdown - dynamically sized and using current column source
         col_var = tk.StringVar(value=initial_column)
         current_columns = self.get_current_columns()
         
-        # Calculate optimal width based on longest column name, with reasonable limits
-        if current_columns:
-            max_width = min(max(len(col) for col in current_columns) + 2, 40)  # +2 for padding, max 40
-            optimal_width = max(max_width, 15)  # minimum 15 chars
-        else:
-            optimal_width = 20
-        
         col_combo = ttk.Combobox(part_frame, textvariable=col_var, 
-                                values=current_columns, width=optimal_width)
+                                values=current_columns, width=self.get_current_column_width())
         col_combo.pack(side=tk.LEFT, padx=(5, 10))
         col_combo.bind("<<ComboboxSelected>>", lambda e: self.update_expression_display())
-        col_combo.bind("<KeyRelease>", lambda e: self.update_expression_display())
+        col_combo.bind("<KeyRelease>", self._schedule_expression_display)
         
         ttk.Radiobutton(part_frame, text="Number:", variable=type_var, value="number",
-                       command=lambda: self.toggle_part_type(part_data)).pack(side=tk.LEFT)
+                       command=functools.partial(self.toggle_part_type, part_data)).pack(side=tk.LEFT)
         
         # Number entry
         num_var = tk.StringVar(value=initial_value if initial_value and not initial_column else "")
         num_entry = ttk.Entry(part_frame, textvariable=num_var, width=10)
         num_entry.pack(side=tk.LEFT, padx=(5, 10))
-        num_entry.bind("<KeyRelease>", lambda e: self.update_expression_display())
+        num_entry.bind("<KeyRelease>", self._schedule_expression_display)
         
         # Remove button (not for first part)
         if len(self.formula_parts) > 0:
             ttk.Button(part_frame, text="×", width=3,
-                      command=lambda: self.remove_formula_part(part_frame, part_data)).pack(side=tk.LEFT)
+                      command=functools.partial(self.remove_formula_part, part_frame, part_data)).pack(side=tk.LEFT)
         
         part_data.update({
             'frame': part_frame,
@@ -1521,7 +1936,7 @@ class ExpressionBuilderDialog:
             'num_entry': num_entry
         })
         
-        self.formula_parts.append(part_data)
+        self.formula_parts[id(part_data)] = part_data
         self.toggle_part_type(part_data)  # Set initial state
         self.update_expression_display()
         
@@ -1541,84 +1956,36 @@ class ExpressionBuilderDialog:
     def remove_formula_part(self, frame, part_data):
         """Remove a formula part."""
         frame.destroy()
-        self.formula_parts = [p for p in self.formula_parts if p != part_data]
+        self.formula_parts.pop(id(part_data), None)
         self.update_expression_display()
         
     def parse_existing_formula(self):
         """Parse existing formula into visual parts."""
-        # Try to parse the formula into visual parts
-        if self.current_formula and self.formula_type.get() == "visual":
-            # More sophisticated parsing that handles quoted strings and doesn't split on hyphens in column names
-            import re
-            
-            # First, extract all quoted strings to protect them
-            quoted_matches = []
-            formula = self.current_formula
-            
-            # Find all quoted strings and replace them with placeholders
-            def replace_quoted(match):
-                placeholder = f"__QUOTED_{len(quoted_matches)}__"
-                quoted_matches.append(match.group(0))
-                return placeholder
-            
-            # Replace quoted strings with placeholders
-            formula_protected = re.sub(r'"[^"]*"', replace_quoted, formula)
-            
-            # Now split by operators (but not hyphens that might be in column names)
-            parts = re.split(r'([+\*/])', formula_protected)
-            
-            # Restore quoted strings
-            for i, part in enumerate(parts):
-                for j, quoted in enumerate(quoted_matches):
-                    if f"__QUOTED_{j}__" in part:
-                        parts[i] = part.replace(f"__QUOTED_{j}__", quoted)
+        if not self.current_formula or self.formula_type.get() != "visual":
+            return
             
-            # Clear existing parts
-            for part in self.formula_parts[:]:
-                self.remove_formula_part(part['frame'], part)
+        # Clear existing parts
+        for part in list(self.formula_parts.values()):
+            self.remove_formula_part(part['frame'], part)
+            
+        # Each operator applies to the part that follows it
+        operator = "+"
+        for match in _FORMULA_TOKEN_RE.finditer(self.current_formula):
+            kind = match.lastindex
+            token = match.group(kind).strip()
+            if kind == 2:
+                operator = token
+                continue
+            if kind == 3 and _NUMBER_RE.fullmatch(token):
+                self.add_formula_part(initial_operator=operator, initial_value=token)
+            else:
+                # Quoted or plain column name
+                self.add_formula_part(initial_column=token, initial_operator=operator)
+            operator = "+"
             
-            # Add parts based on parsed formula
-            for i, part in enumerate(parts):
-                part = part.strip()
-                if not part:
-                    continue
-                    
-                if part in ['+', '*', '/']:
-                    # This is an operator, will be handled by next part
-                    continue
-                    
-                # Check if it's a column name (with or without quotes)
-                is_column = False
-                col_name = ""
-                
-                if part.startswith('"') and part.endswith('"'):
-                    # Quoted column name
-                    col_name = part[1:-1]
-                    if col_name in self.get_current_columns():
-                        is_column = True
-                else:
-                    # Unquoted column name - check if it matches any available columns
-                    col_name = part
-                    if col_name in self.get_current_columns():
-                        is_column = True
-                
-                if is_column:
-                    self.add_formula_part(initial_column=col_name)
-                else:
-                    # Try to parse as number
-                    try:
-                        float(part)
-                        self.add_formula_part(initial_value=part)
-                    except ValueError:
-                        # Not a number, treat as column anyway (might be a column name with spaces or special chars)
-                        self.add_formula_part(initial_column=part)
-        else:
-            # If not visual mode or no formula, just update the interface
-            self.update_formula_interface()
-        
-    def create_manual_formula_entry(self):
+    def create_manual_formula_entry(self, parent):
         """Create manual formula entry interface."""
-        manual_frame = ttk.Frame(self.formula_content_frame)
+        manual_frame = ttk.Frame(parent)
         manual_frame.pack(fill=tk.BOTH, expand=True)
         
         # Instructions
@@ -1631,7 +1998,7 @@ class ExpressionBuilderDialog:
         self.manual_formula_var = tk.StringVar(value=self.current_formula)
         formula_entry = ttk.Entry(manual_frame, textvariable=self.manual_formula_var, width=60)
         formula_entry.pack(fill=tk.X, pady=(5, 10))
-        formula_entry.bind("<KeyRelease>", lambda e: self.update_expression_display())
+        formula_entry.bind("<KeyRelease>", self._schedule_expression_display)
         
         # Quick reference
         ref_frame = ttk.LabelFrame(manual_frame, text="Quick Reference", padding=5)
@@ -1670,6 +2037,18 @@ class ExpressionBuilderDialog:
             self.formula_var.set(formula)
             self.update_expression_display()
             
+    def _schedule_expression_display(self, event=None):
+        """Update the expression preview once typing pauses."""
+        if self._pending_after:
+            self.dialog.after_cancel(self._pending_after)
+        self._pending_after = self.dialog.after(MAPPING_CHANGE_DELAY, self._flush_expression_display)
+        
+    def _flush_expression_display(self):
+        """Run a debounced expression preview update."""
+        self._pending_after = None
+        if self.dialog.winfo_exists():
+            self.update_expression_display()
+            
     def update_expression_display(self):
         """Update the expression preview display."""
         # Check if the dialog still exists
@@ -1689,7 +2068,7 @@ class ExpressionBuilderDialog:
                 # Build expression from visual parts
                 if hasattr(self, 'formula_parts'):
                     formula_parts = []
-                    for i, part in enumerate(self.formula_parts):
+                    for i, part in enumerate(self.formula_parts.values()):
                         part_str = ""
                         
                         # Add operator (except for first part)
@@ -1748,7 +2127,7 @@ class ExpressionBuilderDialog:
                 # Build expression from visual parts
                 if hasattr(self, 'formula_parts'):
                     formula_parts = []
-                    for i, part in enumerate(self.formula_parts):
+                    for i, part in enumerate(self.formula_parts.values()):
                         part_str = ""
                         
                         # Add operator (except for first part)
@@ -1786,16 +2165,24 @@ class ExpressionBuilderDialog:
         stored_expression = "" if mode == "blank" else expression
         display_expression = "(empty column)" if mode == "blank" else expression
         
-        self.row_data['input_var'].set(display_expression)
-        self.row_data['expression_parts'] = {
+        self.row_data.input_var.set(display_expression)
+        self.row_data.expression_parts = {
             'mode': mode,
             'expression': stored_expression,
             'display_expression': display_expression
         }
         
         # Call callback
-        self.callback(self.row_data['index'])
+        self.callback(self.row_data.row_id)
         
+        # Close through the cancel path so a queued preview update is dropped
+        self.on_cancel()
+        
+    def on_cancel(self):
+        """Handle cancel or close, dropping any pending preview update."""
+        if self._pending_after:
+            self.dialog.after_cancel(self._pending_after)
+            self._pending_after = None
         self.dialog.destroy()
         
     def _update_dialog_scrollbar(self, canvas, scrollbar):
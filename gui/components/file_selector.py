@@ -210,7 +210,7 @@ class FileSelector(ttk.Frame):
         """Open dialog to select output directory."""
         directory = filedialog.askdirectory(
             title="Select Output Directory",
-            initialdir=self.output_dir_var.get() or str(OUTPUT_DIR)
+            initialdir=self.output_dir_var.get() or str(get_output_dir())
         )
         
         if directory:
@@ -319,7 +319,10 @@ class OutputSettings(ttk.Frame):
         
     def set_output_columns(self, output_columns):
         """Set output columns for freeze panes selection."""
-        self.output_columns = output_columns if output_columns else []
+        output_columns = output_columns if output_columns else []
+        if output_columns == self.output_columns:
+            return  # Names unchanged, keep the existing checkboxes
+        self.output_columns = output_columns
         self._update_freeze_columns()
         
         
@@ -41,6 +41,7 @@ class MainController:
         
     def setup_logging(self):
         """Set up logging configuration."""
+        ensure_dirs()
         logging.basicConfig(
             level=getattr(logging, LOG_LEVEL),
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -348,26 +349,15 @@ class MainController:
             
             self.logger.info(f"Found {len(excel_files)} Excel files to process")
             
-            # Process each file
-            output_files = []
-            for excel_file in excel_files:
-                try:
-                    self.logger.info(f"Processing file: {excel_file.name}")
-                    
-                    # Process the file
-                    output_file_path = self.excel_processor.process_file(
-                        excel_file, 
-                        output_dir_path, 
-                        config
-                    )
-                    
-                    output_files.append(str(output_file_path))
-                    self.logger.info(f"Successfully processed: {excel_file.name}")
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing file {excel_file.name}: {str(e)}")
-                    # Continue processing other files even if one fails
-                    continue
+            # Process files in parallel; failed files are logged and skipped
+            output_files = [
+                str(output_file_path)
+                for output_file_path in self.excel_processor.process_files(
+                    excel_files,
+                    output_dir_path,
+                    config
+                )
+            ]
             
             self.logger.info(f"Batch processing complete: {len(output_files)} files processed successfully")
             return output_files
@@ -430,7 +420,7 @@ class MainController:
         Returns:
             Default configuration dictionary
         """
-        return DEFAULT_MAPPING_CONFIG.copy()
+        return self.config_manager.get_default_config()
         
     def validate_configuration(self, config: Dict[str, Any]) -> tuple[bool, str]:
         """
@@ -38,7 +38,7 @@ class MainWindow(ttk.Frame):
         
         # Initialize variables
         self.input_file_path = tk.StringVar()
-        self.output_directory = tk.StringVar(value=str(OUTPUT_DIR))
+        self.output_directory = tk.StringVar(value=str(get_output_dir()))
         self.processing_thread = None
         self.current_tab = 0  # Track current tab (0=File Selection, 1=Column Mapping, 2=Output Settings)
         self.mapping_has_changes = False  # Track if mappings have been changed from defaults
@@ -16,6 +16,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import argparse
 import logging
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -43,8 +44,8 @@ class ExcelFormatterApp:
         
     def setup_logging(self):
         """Configure application logging."""
-        # Ensure log directory exists
-        LOG_DIR.mkdir(exist_ok=True)
+        # Ensure application directories (including logs) exist
+        ensure_dirs()
         
         # Configure logging
         logging.basicConfig(
@@ -271,4 +272,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for batch worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file